@@ -3,26 +3,47 @@ Deduplication Engine for Duplicate File Finder.
 Implements multi-stage duplicate detection pipeline.
 """
 
-from dataclasses import dataclass
-from typing import List, Dict, Optional, Callable
+import os
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Callable, Set, Tuple
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import json
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import sqlite3
 
-from file_scanner import FileInfo
-from utils import compute_file_hash, format_bytes
+import numpy as np
+
+from file_scanner import FileInfo, FileTable
+from hamming import hamming_edges
+from hash_cache import HashCache
+from settings import CONFIG_PATH, load_config
+from workers import compute_phash, init_worker
+from utils import compute_file_hash, compute_partial_hash, format_bytes, BLAKE3_AVAILABLE
 from logger import get_logger
 
 logger = get_logger()
 
+# Bytes read from the head and tail of a file before committing to a full hash
+PARTIAL_HASH_BYTES = 4 * 1024
+
+# Below this many images, perceptual hashes are computed without worker processes
+PHASH_PROCESS_MIN_FILES = 64
+
 
-@dataclass
+@dataclass(slots=True)
 class DuplicateGroup:
     """Represents a group of duplicate files."""
     files: List[FileInfo]
     detection_method: str  # 'hash' or 'perceptual'
     similarity_score: float = 100.0  # 100 = exact duplicate, <100 = similar
     
+    # Per-file sort keys, precomputed so keeper selection is a single argmin/argmax
+    # (resolutions are only read if the highest resolution strategy asks);
+    # also handed to SuggestionEngine.suggest_keeper
+    table: FileTable = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.table = FileTable(self.files)
+    
     def get_total_wasted_space(self) -> int:
         """Calculate total wasted disk space (all files except one)."""
         if len(self.files) <= 1:
@@ -45,22 +66,21 @@ class DuplicateGroup:
             return None
         
         if strategy == 'keep_oldest':
-            return min(self.files, key=lambda f: f.created_time)
+            return self.files[int(self.table.created.argmin())]
         
         elif strategy == 'keep_newest':
-            return max(self.files, key=lambda f: f.created_time)
+            return self.files[int(self.table.created.argmax())]
         
         elif strategy == 'keep_highest_resolution':
-            # Filter files with valid resolution
-            files_with_res = [f for f in self.files if f.resolution]
-            if not files_with_res:
+            # Files without resolution have area -1
+            areas = self.table.areas
+            best = int(areas.argmax())
+            if areas[best] < 0:
                 return self.files[0]  # Fallback to first file
-            
-            # Calculate area (width * height)
-            return max(files_with_res, key=lambda f: f.resolution[0] * f.resolution[1])
+            return self.files[best]
         
         elif strategy == 'keep_shortest_path':
-            return min(self.files, key=lambda f: len(f.path))
+            return self.files[int(self.table.path_lengths.argmin())]
         
         else:
             return self.files[0]
@@ -78,8 +98,9 @@ class DuplicateGroup:
             return f"Newest file (created {date_str})"
         
         elif strategy == 'keep_highest_resolution':
-            if keeper.resolution:
-                return f"Highest resolution ({keeper.resolution[0]}x{keeper.resolution[1]})"
+            resolution = keeper.get_resolution()
+            if resolution:
+                return f"Highest resolution ({resolution[0]}x{resolution[1]})"
             return "First file (no resolution data)"
         
         elif strategy == 'keep_shortest_path':
@@ -102,25 +123,44 @@ class DuplicateGroup:
 class DeduplicationEngine:
     """Multi-stage deduplication engine."""
     
-    def __init__(self, config_path: str = "config.json"):
+    def __init__(self, config_path: str = CONFIG_PATH):
         """Initialize the deduplication engine."""
-        self.config = self._load_config(config_path)
+        self.config = load_config(config_path)
+        # Relative paths in the config are relative to the config file, not the working directory
+        self.config_dir = os.path.dirname(os.path.abspath(config_path))
         self.max_workers = self.config.get('performance', {}).get('max_worker_threads', 4)
-        self.hash_chunk_size = self.config.get('performance', {}).get('hash_chunk_size_kb', 64)
+        self.hash_chunk_size = self.config.get('performance', {}).get('hash_chunk_size_kb', 1024)
+        self.hash_algo = self.config.get('performance', {}).get('hash_algorithm', 'blake3')
+        self.io_queue_depth = self.config.get('performance', {}).get('io_queue_depth', 32)
+        
+        if self.hash_algo == 'blake3' and not BLAKE3_AVAILABLE:
+            logger.warning("blake3 library not available. Falling back to SHA-256 hashing.")
+            self.hash_algo = 'sha256'
+        
+        # Opened for Stage 2 of each find_duplicates call, closed again after it
+        self.hash_cache: Optional[HashCache] = None
+        
+    def _open_hash_cache(self) -> Optional[HashCache]:
+        """Open the persistent hash cache if enabled in config."""
+        cache_config = self.config.get('hash_cache', {})
+        if not cache_config.get('enabled', True):
+            return None
+        
+        db_path = cache_config.get('path')
+        if db_path:
+            db_path = os.path.join(self.config_dir, os.path.expanduser(db_path))
         
-    def _load_config(self, config_path: str) -> dict:
-        """Load configuration from JSON file."""
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.warning(f"Unable to load config: {e}")
-            return {}
+            return HashCache(db_path)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Unable to open hash cache: {e}. Hashes will not be cached.")
+            return None
     
     def find_duplicates(self, 
                        files: List[FileInfo],
                        use_perceptual: bool = False,
-                       progress_callback: Optional[Callable[[int, int], None]] = None) -> List[DuplicateGroup]:
+                       progress_callback: Optional[Callable[[int, int], None]] = None,
+                       size_buckets: Optional[Dict[int, List[int]]] = None) -> List[DuplicateGroup]:
         """
         Find duplicate files using multi-stage pipeline.
         
@@ -128,6 +168,8 @@ class DeduplicationEngine:
             files: List of FileInfo objects to analyze
             use_perceptual: Enable perceptual hashing for similar images
             progress_callback: Optional callback(current, total)
+            size_buckets: Optional FileScanner.size_buckets for these files,
+                          letting Stage 1 skip size-unique files directly
             
         Returns:
             List of DuplicateGroup objects
@@ -135,16 +177,22 @@ class DeduplicationEngine:
         logger.info(f"Starting deduplication of {len(files)} files")
         
         # Stage 1: Group by size and extension (fast pre-filter)
-        size_groups = self._group_by_size_and_extension(files)
+        size_groups = self._group_by_size_and_extension(files, size_buckets)
         logger.info(f"Stage 1: Found {len(size_groups)} size groups")
         
         # Stage 2: Hash-based exact duplicate detection
-        duplicate_groups = self._find_exact_duplicates(size_groups, progress_callback)
+        self.hash_cache = self._open_hash_cache()
+        try:
+            duplicate_groups, duplicate_paths = self._find_exact_duplicates(size_groups, progress_callback)
+        finally:
+            if self.hash_cache:
+                self.hash_cache.close()
+                self.hash_cache = None
         logger.info(f"Stage 2: Found {len(duplicate_groups)} exact duplicate groups")
         
         # Stage 3: Optional perceptual hashing
         if use_perceptual:
-            perceptual_groups = self._find_similar_images(files, duplicate_groups, progress_callback)
+            perceptual_groups = self._find_similar_images(files, duplicate_paths, progress_callback)
             duplicate_groups.extend(perceptual_groups)
             logger.info(f"Stage 3: Found {len(perceptual_groups)} similar image groups")
         
@@ -156,155 +204,363 @@ class DeduplicationEngine:
         
         return duplicate_groups
     
-    def _group_by_size_and_extension(self, files: List[FileInfo]) -> Dict[tuple, List[FileInfo]]:
+    def _group_by_size_and_extension(self, 
+                                     files: List[FileInfo], 
+                                     size_buckets: Optional[Dict[int, List[int]]] = None) -> Dict[tuple, List[FileInfo]]:
         """
         Stage 1: Group files by (size, extension).
         
+        With size buckets from the scanner, only buckets holding more than one
+        file are split by extension. Otherwise grouping keys are computed on
+        NumPy arrays so singletons are discarded without building per-key
+        Python lists. Sizes must fit in 48 bits.
+        
+        Args:
+            files: List of FileInfo objects to group
+            size_buckets: Optional mapping of file size to indices into files
+        
         Returns:
             Dictionary mapping (size, extension) to list of files
         """
-        groups = defaultdict(list)
+        if not files:
+            return {}
+        
+        if size_buckets is not None:
+            groups = defaultdict(list)
+            for size, indices in size_buckets.items():
+                if len(indices) > 1:
+                    for i in indices:
+                        groups[(size, files[i].extension)].append(files[i])
+            return {key: group for key, group in groups.items() if len(group) > 1}
         
-        for file_info in files:
-            key = (file_info.size, file_info.extension)
-            groups[key].append(file_info)
+        # Pack (size, extension code) into one uint64 key per file
+        sizes = np.fromiter((f.size for f in files), dtype=np.uint64, count=len(files))
+        _, ext_codes = np.unique([f.extension for f in files], return_inverse=True)
+        keys = (sizes << np.uint64(16)) | ext_codes.astype(np.uint64)
         
-        # Filter out singleton groups (no possible duplicates)
-        return {k: v for k, v in groups.items() if len(v) > 1}
+        # Filter out singleton groups (no possible duplicates) before building lists
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        candidates = np.nonzero(counts[inverse] > 1)[0]
+        
+        groups = defaultdict(list)
+        for i in candidates.tolist():
+            file_info = files[i]
+            groups[(file_info.size, file_info.extension)].append(file_info)
+        
+        return dict(groups)
     
     def _find_exact_duplicates(self, 
                                size_groups: Dict[tuple, List[FileInfo]],
-                               progress_callback: Optional[Callable[[int, int], None]]) -> List[DuplicateGroup]:
+                               progress_callback: Optional[Callable[[int, int], None]]) -> Tuple[List[DuplicateGroup], Set[str]]:
         """
-        Stage 2: Find exact duplicates using SHA-256 hashing.
+        Stage 2: Find exact duplicates using content hashing (BLAKE3 by default).
+        
+        Candidates are narrowed progressively: first by a digest of the file
+        head, then of the file tail, and only the remaining collisions are
+        fully hashed. Full hashes are reused from the hash cache when the
+        file is unchanged since a previous scan.
         
         Args:
             size_groups: Groups of files with same size and extension
             progress_callback: Progress callback
             
         Returns:
-            List of DuplicateGroup objects for exact duplicates
+            Tuple of (DuplicateGroup objects for exact duplicates,
+            set of paths contained in those groups)
         """
-        duplicate_groups = []
-        
-        # Calculate total files to process
         total_files = sum(len(files) for files in size_groups.values())
         processed_files = 0
         
-        for (size, ext), file_list in size_groups.items():
-            # Compute hashes for all files in this size group
-            hash_map = defaultdict(list)
+        def settle(count: int):
+            """Record files whose duplicate status is now known."""
+            nonlocal processed_files
+            processed_files += count
+            if progress_callback and count:
+                progress_callback(processed_files, total_files)
+        
+        exact_groups = []
+        pending_groups = []
+        cached = {}
+        
+        for file_list in size_groups.values():
+            hits = self._get_cached_hashes(file_list)
+            if len(hits) == len(file_list):
+                # Every file is unchanged since a previous scan
+                exact_groups.extend(self._split_by_hash([file_list], hits))
+                settle(len(file_list))
+            else:
+                pending_groups.append(file_list)
+                cached.update(hits)
+        
+        # Pools are shared by all size groups so I/O stays pipelined across them.
+        # Probes are latency-bound small reads, so they get a deeper queue than
+        # the CPU-bound full hashes.
+        if pending_groups:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor, \
+                    ThreadPoolExecutor(max_workers=self.io_queue_depth) as io_executor:
+                exact_groups.extend(
+                    self._probe_and_hash(executor, io_executor, pending_groups, cached, settle)
+                )
+        
+        # Create duplicate groups for files with same hash
+        duplicate_groups = [
+            DuplicateGroup(files=files_with_hash, detection_method='hash', similarity_score=100.0)
+            for files_with_hash in exact_groups
+        ]
+        duplicate_paths = {f.path for files_with_hash in exact_groups for f in files_with_hash}
+        
+        return duplicate_groups, duplicate_paths
+    
+    def _probe_and_hash(self,
+                        executor: ThreadPoolExecutor,
+                        io_executor: ThreadPoolExecutor,
+                        groups: List[List[FileInfo]],
+                        cached: Dict[str, str],
+                        settle: Callable[[int], None]) -> List[List[FileInfo]]:
+        """
+        Split size groups by head probe, tail probe and full hash.
+        
+        Each tier is submitted for all remaining groups at once. A group leaves
+        the pipeline as soon as the bytes already compared cover the whole file.
+        
+        Args:
+            executor: Thread pool used for full-file hashes
+            io_executor: Thread pool used for head/tail probes
+            groups: Groups of files sharing the same size and extension
+            cached: Full hashes already known from the hash cache
+            settle: Called with the number of files resolved after each step
+            
+        Returns:
+            Groups of files with identical content
+        """
+        resolved = []
+        incoming = sum(len(group) for group in groups)
+        
+        # Tier 1: head of the file
+        digests = self._compute_hashes(
+            io_executor, [f for group in groups for f in group],
+            compute_partial_hash, 0, PARTIAL_HASH_BYTES
+        )
+        candidates = self._split_by_hash(groups, digests)
+        resolved.extend(g for g in candidates if g[0].size <= PARTIAL_HASH_BYTES)
+        candidates = [g for g in candidates if g[0].size > PARTIAL_HASH_BYTES]
+        
+        remaining = sum(len(group) for group in candidates)
+        settle(incoming - remaining)
+        incoming = remaining
+        
+        # Tier 2: tail of the file
+        digests = self._compute_hashes(
+            io_executor, [f for group in candidates for f in group],
+            compute_partial_hash, -PARTIAL_HASH_BYTES, PARTIAL_HASH_BYTES
+        )
+        candidates = self._split_by_hash(candidates, digests)
+        resolved.extend(g for g in candidates if g[0].size <= 2 * PARTIAL_HASH_BYTES)
+        candidates = [g for g in candidates if g[0].size > 2 * PARTIAL_HASH_BYTES]
+        
+        remaining = sum(len(group) for group in candidates)
+        settle(incoming - remaining)
+        
+        # Tier 3: full content, reusing cached hashes where possible
+        pending = [f for group in candidates for f in group if f.path not in cached]
+        settle(remaining - len(pending))
+        
+        digests = self._compute_hashes(
+            executor, pending, compute_file_hash, self.hash_algo, self.hash_chunk_size,
+            on_done=lambda: settle(1)
+        )
+        if self.hash_cache:
+            self.hash_cache.put_many(digests, self.hash_algo)
+        digests.update(cached)
+        resolved.extend(self._split_by_hash(candidates, digests))
+        
+        return resolved
+    
+    def _get_cached_hashes(self, file_list: List[FileInfo]) -> Dict[str, str]:
+        """Return full hashes from the hash cache for unchanged files."""
+        if not self.hash_cache:
+            return {}
+        
+        try:
+            return self.hash_cache.get_many([f.path for f in file_list], self.hash_algo)
+        except sqlite3.Error as e:
+            logger.warning(f"Hash cache lookup failed: {e}")
+            return {}
+    
+    def _compute_hashes(self,
+                        executor: ThreadPoolExecutor,
+                        file_list: List[FileInfo],
+                        hash_func: Callable,
+                        *hash_args,
+                        on_done: Optional[Callable[[], None]] = None) -> Dict[str, object]:
+        """
+        Compute digests for files in parallel.
+        
+        Args:
+            executor: Thread pool used to compute the digests
+            file_list: Files to hash
+            hash_func: Callable(path, *hash_args) returning a digest or None
+            *hash_args: Extra arguments passed to hash_func
+            on_done: Optional callback invoked after each file completes
             
-            # Use thread pool for parallel hashing
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                future_to_file = {
-                    executor.submit(compute_file_hash, f.path, 'sha256', self.hash_chunk_size): f
-                    for f in file_list
-                }
+        Returns:
+            Dictionary mapping path to digest (failures are omitted)
+        """
+        digests = {}
+        
+        future_to_file = {
+            executor.submit(hash_func, f.path, *hash_args): f
+            for f in file_list
+        }
+        
+        try:
+            for future in as_completed(future_to_file):
+                file_info = future_to_file[future]
+                try:
+                    file_hash = future.result()
+                    if file_hash:
+                        digests[file_info.path] = file_hash
+                
+                except Exception as e:
+                    logger.error(f"Error hashing {file_info.path}: {e}")
                 
-                for future in as_completed(future_to_file):
-                    file_info = future_to_file[future]
-                    try:
-                        file_hash = future.result()
-                        if file_hash:
-                            hash_map[file_hash].append(file_info)
-                        
-                        processed_files += 1
-                        if progress_callback and processed_files % 10 == 0:
-                            progress_callback(processed_files, total_files)
-                    
-                    except Exception as e:
-                        logger.error(f"Error hashing {file_info.path}: {e}")
+                if on_done:
+                    on_done()
+        except BaseException:
+            # A progress callback may raise to abort; don't hash the queued files
+            for future in future_to_file:
+                future.cancel()
+            raise
+        
+        return digests
+    
+    def _split_by_hash(self,
+                       groups: List[List[FileInfo]],
+                       digests: Dict[str, object]) -> List[List[FileInfo]]:
+        """
+        Split candidate groups by digest.
+        
+        Args:
+            groups: Candidate groups to split
+            digests: Dictionary mapping path to digest
             
-            # Create duplicate groups for files with same hash
-            for file_hash, files_with_hash in hash_map.items():
-                if len(files_with_hash) > 1:
-                    group = DuplicateGroup(
-                        files=files_with_hash,
-                        detection_method='hash',
-                        similarity_score=100.0
-                    )
-                    duplicate_groups.append(group)
+        Returns:
+            Sub-groups of files sharing a digest (singletons and unhashed files dropped)
+        """
+        hash_map = defaultdict(list)
         
-        return duplicate_groups
+        for group_index, file_list in enumerate(groups):
+            for file_info in file_list:
+                file_hash = digests.get(file_info.path)
+                if file_hash:
+                    hash_map[(group_index, file_hash)].append(file_info)
+        
+        return [files for files in hash_map.values() if len(files) > 1]
     
     def _find_similar_images(self,
                             all_files: List[FileInfo],
-                            exact_duplicates: List[DuplicateGroup],
+                            exact_duplicate_paths: Set[str],
                             progress_callback: Optional[Callable[[int, int], None]]) -> List[DuplicateGroup]:
         """
         Stage 3: Find visually similar images using perceptual hashing.
         
         Args:
             all_files: All scanned files
-            exact_duplicates: Already found exact duplicates (to exclude)
+            exact_duplicate_paths: Paths already in exact duplicate groups (to exclude)
             progress_callback: Progress callback
             
         Returns:
             List of DuplicateGroup objects for similar images
         """
         try:
-            import imagehash
-            from PIL import Image
+            import imagehash  # noqa: F401 - availability check, used in worker processes
         except ImportError:
             logger.warning("imagehash library not available. Skipping perceptual hashing.")
             return []
         
-        # Get files already in exact duplicate groups
-        exact_duplicate_paths = set()
-        for group in exact_duplicates:
-            for file_info in group.files:
-                exact_duplicate_paths.add(file_info.path)
-        
         # Filter out exact duplicates
         files_to_check = [f for f in all_files if f.path not in exact_duplicate_paths]
         
         logger.info(f"Computing perceptual hashes for {len(files_to_check)} files")
         
-        # Compute perceptual hashes
+        # Compute perceptual hashes in worker processes; decoding is CPU-bound
+        # and average_hash holds the GIL, so threads would not scale. Small
+        # batches are hashed inline since starting workers costs more.
         phash_map = {}
-        for i, file_info in enumerate(files_to_check):
-            try:
-                with Image.open(file_info.path) as img:
-                    phash = imagehash.average_hash(img)
+        executor = None
+        if len(files_to_check) >= PHASH_PROCESS_MIN_FILES:
+            executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=init_worker)
+            results = executor.map(compute_phash, (f.path for f in files_to_check), chunksize=32)
+        else:
+            results = map(compute_phash, (f.path for f in files_to_check))
+        
+        try:
+            for i, (file_info, (phash, error)) in enumerate(zip(files_to_check, results)):
+                if phash is not None:
                     phash_map[file_info.path] = (phash, file_info)
+                else:
+                    logger.warning(f"Unable to compute perceptual hash for {file_info.path}: {error}")
                 
                 if progress_callback and i % 10 == 0:
                     progress_callback(i, len(files_to_check))
-            
-            except Exception as e:
-                logger.warning(f"Unable to compute perceptual hash for {file_info.path}: {e}")
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
         
         # Find similar images based on hash distance
         threshold = self.config.get('perceptual_hash', {}).get('similarity_threshold', 5)
+        entries = list(phash_map.values())
+        clusters = self._cluster_by_hamming([phash for phash, _ in entries], threshold)
+        
         similar_groups = []
-        processed = set()
+        for indices in clusters:
+            similarity_score = 100 - (threshold * 2)  # Rough approximation
+            group = DuplicateGroup(
+                files=[entries[i][1] for i in indices],
+                detection_method='perceptual',
+                similarity_score=similarity_score
+            )
+            similar_groups.append(group)
         
-        for path1, (hash1, file1) in phash_map.items():
-            if path1 in processed:
-                continue
-            
-            similar_files = [file1]
-            processed.add(path1)
-            
-            for path2, (hash2, file2) in phash_map.items():
-                if path2 in processed:
-                    continue
-                
-                # Calculate hamming distance
-                distance = hash1 - hash2
-                if distance <= threshold:
-                    similar_files.append(file2)
-                    processed.add(path2)
+        return similar_groups
+    
+    def _cluster_by_hamming(self, phashes: list, threshold: int) -> List[List[int]]:
+        """
+        Cluster perceptual hashes whose Hamming distance is within threshold.
+        
+        Hashes are packed into a uint64 array and matching pairs are found by
+        hamming_edges. Pairs are merged with union-find, so transitively
+        similar images end up in the same cluster.
+        
+        Args:
+            phashes: List of imagehash.ImageHash objects (64-bit)
+            threshold: Maximum Hamming distance to consider similar
             
-            # Create group if we found similar images
-            if len(similar_files) > 1:
-                similarity_score = 100 - (threshold * 2)  # Rough approximation
-                group = DuplicateGroup(
-                    files=similar_files,
-                    detection_method='perceptual',
-                    similarity_score=similarity_score
-                )
-                similar_groups.append(group)
+        Returns:
+            List of index lists, one per cluster with more than one member
+        """
+        if len(phashes) < 2:
+            return []
         
-        return similar_groups
+        bits = np.stack([phash.hash.flatten() for phash in phashes])
+        hashes = np.packbits(bits, axis=1).view(np.uint64).ravel()
+        
+        parent = list(range(len(phashes)))
+        
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        for i, j in hamming_edges(hashes, threshold).tolist():
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[root_j] = root_i
+        
+        clusters = defaultdict(list)
+        for i in range(len(phashes)):
+            clusters[find(i)].append(i)
+        
+        return [indices for indices in clusters.values() if len(indices) > 1]
+
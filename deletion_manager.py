@@ -11,9 +11,10 @@ from datetime import datetime
 from enum import Enum
 
 try:
-    import send2trash
+    from send2trash import send2trash as _send2trash
     SEND2TRASH_AVAILABLE = True
 except ImportError:
+    _send2trash = None
     SEND2TRASH_AVAILABLE = False
 
 from utils import is_file_locked, format_bytes
@@ -21,6 +22,14 @@ from logger import get_logger, log_deletion
 
 logger = get_logger()
 
+# Number of files moved to the recycle bin per shell operation
+TRASH_BATCH_SIZE = 256
+
+# Bound once to skip attribute lookups in the per-file deletion loop
+_os_open = os.open
+_os_close = os.close
+_os_remove = os.remove
+
 
 class DeletionMethod(Enum):
     """Deletion method enumeration."""
@@ -109,22 +118,10 @@ class DeletionManager:
         """
         logger.info(f"Starting deletion of {len(file_paths)} files using {method.value}")
         
-        results = []
+        # Space freed is not tracked here; use delete_files_with_sizes for that
+        results = self._delete_paths(file_paths, method)
         total_space_freed = 0
         
-        for file_path in file_paths:
-            result = self._delete_single_file(file_path, method)
-            results.append(result)
-            
-            # Track space freed only for successful deletions
-            if result.success and method != DeletionMethod.DRY_RUN:
-                try:
-                    # File is already deleted, we need to have tracked size beforehand
-                    # For simplicity, we'll rely on the caller to provide size info
-                    pass
-                except:
-                    pass
-        
         # Calculate statistics
         successful = sum(1 for r in results if r.success)
         failed = len(results) - successful
@@ -160,13 +157,10 @@ class DeletionManager:
         """
         logger.info(f"Starting deletion of {len(file_paths_with_sizes)} files using {method.value}")
         
-        results = []
+        results = self._delete_paths([path for path, _ in file_paths_with_sizes], method)
         total_space_freed = 0
         
-        for file_path, file_size in file_paths_with_sizes:
-            result = self._delete_single_file(file_path, method)
-            results.append(result)
-            
+        for result, (_, file_size) in zip(results, file_paths_with_sizes):
             # Track space freed only for successful deletions
             if result.success and method != DeletionMethod.DRY_RUN:
                 total_space_freed += file_size
@@ -192,6 +186,92 @@ class DeletionManager:
                    f"Space freed: {format_bytes(total_space_freed)}")
         return report
     
+    def _delete_paths(self, file_paths: List[str], method: DeletionMethod) -> List[DeletionResult]:
+        """
+        Delete files, batching recycle bin moves.
+        
+        Args:
+            file_paths: Paths of files to delete
+            method: Deletion method
+            
+        Returns:
+            DeletionResult for each path, in input order
+        """
+        if method != DeletionMethod.RECYCLE_BIN or not SEND2TRASH_AVAILABLE:
+            return [self._delete_single_file(path, method) for path in file_paths]
+        
+        results: List[Optional[DeletionResult]] = [None] * len(file_paths)
+        batch: List[int] = []
+        
+        for i, file_path in enumerate(file_paths):
+            results[i] = self._validate_file(file_path, method)
+            if results[i] is None:
+                batch.append(i)
+            
+            if len(batch) == TRASH_BATCH_SIZE:
+                self._trash_batch(file_paths, batch, results)
+                batch = []
+        
+        if batch:
+            self._trash_batch(file_paths, batch, results)
+        
+        return results
+    
+    def _trash_batch(self, file_paths: List[str], batch: List[int], results: List[Optional[DeletionResult]]):
+        """
+        Move a batch of validated files to the recycle bin in one call.
+        
+        send2trash performs a single shell operation for a list of paths on
+        Windows. If the batch fails, each file is retried on its own so errors
+        are attributed to the right path.
+        
+        Args:
+            file_paths: All paths being deleted
+            batch: Indices into file_paths of the files in this batch
+            results: Result list to fill in at the batch indices
+        """
+        method = DeletionMethod.RECYCLE_BIN
+        
+        try:
+            _send2trash([file_paths[i] for i in batch])
+        except Exception as e:
+            logger.warning(f"Batch move to recycle bin failed ({e}). Retrying files individually.")
+            for i in batch:
+                if os.path.exists(file_paths[i]):
+                    results[i] = self._delete_single_file(file_paths[i], method)
+                else:
+                    # Already moved before the batch failed
+                    log_deletion(file_paths[i], method.value, "success")
+                    results[i] = DeletionResult(file_paths[i], True, method.value)
+            return
+        
+        for i in batch:
+            log_deletion(file_paths[i], method.value, "success")
+            results[i] = DeletionResult(file_paths[i], True, method.value)
+    
+    def _validate_file(self, file_path: str, method: DeletionMethod) -> Optional[DeletionResult]:
+        """
+        Run pre-deletion safety checks.
+        
+        A single write-mode open covers both the existence and the lock check,
+        and never creates a file that vanished after scanning.
+        
+        Returns:
+            A failed DeletionResult if the file cannot be deleted, otherwise None
+        """
+        try:
+            _os_close(_os_open(file_path, os.O_WRONLY))
+            return None
+        
+        except FileNotFoundError:
+            error_msg = "File does not exist"
+        
+        except OSError:
+            error_msg = "File is locked by another process"
+        
+        log_deletion(file_path, method.value, "failed", error_msg)
+        return DeletionResult(file_path, False, method.value, error_msg)
+    
     def _delete_single_file(self, file_path: str, method: DeletionMethod) -> DeletionResult:
         """
         Delete a single file.
@@ -204,15 +284,9 @@ class DeletionManager:
             DeletionResult for this file
         """
         # Pre-validation checks
-        if not os.path.exists(file_path):
-            error_msg = "File does not exist"
-            log_deletion(file_path, method.value, "failed", error_msg)
-            return DeletionResult(file_path, False, method.value, error_msg)
-        
-        if is_file_locked(file_path):
-            error_msg = "File is locked by another process"
-            log_deletion(file_path, method.value, "failed", error_msg)
-            return DeletionResult(file_path, False, method.value, error_msg)
+        failure = self._validate_file(file_path, method)
+        if failure:
+            return failure
         
         # Dry run - just validate, don't delete
         if method == DeletionMethod.DRY_RUN:
@@ -227,7 +301,7 @@ class DeletionManager:
                 return DeletionResult(file_path, False, method.value, error_msg)
             
             try:
-                send2trash.send2trash(file_path)
+                _send2trash(file_path)
                 log_deletion(file_path, method.value, "success")
                 return DeletionResult(file_path, True, method.value)
             
@@ -239,7 +313,7 @@ class DeletionManager:
         # Hard delete (permanent)
         if method == DeletionMethod.HARD_DELETE:
             try:
-                os.remove(file_path)
+                _os_remove(file_path)
                 log_deletion(file_path, method.value, "success")
                 return DeletionResult(file_path, True, method.value)
             
@@ -263,18 +337,27 @@ class DeletionManager:
         log_filename = f"deletion_{timestamp}.json"
         log_path = os.path.join(self.log_dir, log_filename)
         
-        log_data = {
+        successful = sum(1 for r in results if r.success)
+        log_header = {
             'timestamp': datetime.now().isoformat(),
             'method': method.value,
             'total_files': len(results),
-            'successful': sum(1 for r in results if r.success),
-            'failed': sum(1 for r in results if not r.success),
-            'results': [r.to_dict() for r in results]
+            'successful': successful,
+            'failed': len(results) - successful
         }
         
         try:
+            # Stream results one record at a time so memory stays bounded
+            # regardless of how many files were deleted
             with open(log_path, 'w', encoding='utf-8') as f:
-                json.dump(log_data, f, indent=2, ensure_ascii=False)
+                f.write('{\n')
+                for key, value in log_header.items():
+                    f.write(f'  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n')
+                f.write('  "results": [')
+                for i, result in enumerate(results):
+                    f.write(',\n    ' if i else '\n    ')
+                    f.write(json.dumps(result.to_dict(), ensure_ascii=False))
+                f.write('\n  ]\n}\n' if results else ']\n}\n')
             logger.info(f"Deletion log saved to {log_path}")
         except Exception as e:
             logger.error(f"Failed to save deletion log: {e}")
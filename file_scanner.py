@@ -4,19 +4,37 @@ Recursively scans directories and collects image files with metadata.
 """
 
 import os
-from dataclasses import dataclass
-from typing import List, Callable, Optional, Set
+import sys
+import copy
+import functools
+from dataclasses import dataclass, field
+from typing import List, Callable, Optional, Set, Tuple
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import json
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+import time
 
-from utils import get_image_resolution, is_system_folder, get_file_times
+import numpy as np
+
+from settings import CONFIG_PATH, load_config
+from utils import get_image_resolution, is_system_folder
+from workers import init_worker, scan_root_columns
 from logger import get_logger
 
 logger = get_logger()
 
+IS_WINDOWS = os.name == 'nt'
+
+# Minimum seconds between progress callbacks during a scan
+PROGRESS_INTERVAL = 0.05
+
+# Longest a scan waits on its workers before checking for cancellation again
+CANCEL_POLL_INTERVAL = 0.1
+
+# Parsed config files keyed by (path, mtime in ns, size), shared by all scanner instances
+_CONFIG_CACHE = {}
 
-@dataclass
+
+@dataclass(slots=True)
 class FileInfo:
     """Represents metadata for a scanned file."""
     path: str
@@ -26,13 +44,28 @@ class FileInfo:
     created_time: float
     modified_time: float
     
+    # False until the resolution has been read from the image header
+    _resolution_loaded: bool = field(default=True, repr=False, compare=False)
+    
+    def get_resolution(self) -> Optional[tuple]:
+        """
+        Get the image resolution, reading it from the file on first use.
+        
+        The scanner leaves resolution unloaded, so only files that end up in
+        a duplicate group are ever opened for their dimensions.
+        """
+        if not self._resolution_loaded:
+            self.resolution = get_image_resolution(self.path, self.modified_time, self.size)
+            self._resolution_loaded = True
+        return self.resolution
+    
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
         return {
             'path': self.path,
             'size': self.size,
             'extension': self.extension,
-            'resolution': self.resolution,
+            'resolution': self.get_resolution(),
             'created_time': self.created_time,
             'modified_time': self.modified_time,
             'created_date': datetime.fromtimestamp(self.created_time).isoformat(),
@@ -40,50 +73,155 @@ class FileInfo:
         }
 
 
+class FileTable:
+    """
+    Column-wise (struct-of-arrays) view of a list of FileInfo objects.
+    
+    Each metadata field is held in its own NumPy array so that min/max
+    selections over many files run as single vectorized reductions. The
+    resolution columns are built on first use, so only the highest
+    resolution strategy ever opens image headers.
+    """
+    
+    def __init__(self, files: List[FileInfo]):
+        """
+        Build the table from scanned files.
+        
+        Args:
+            files: FileInfo objects, in the order rows should be indexed
+        """
+        self.files = files
+        self.paths = [f.path for f in files]
+        
+        # Extensions are interned so each row stores a small index
+        self.extensions = sorted({f.extension for f in files})
+        ext_index = {ext: i for i, ext in enumerate(self.extensions)}
+        
+        sizes, created, modified, ext_ids = [], [], [], []
+        for f in files:
+            sizes.append(f.size)
+            created.append(f.created_time)
+            modified.append(f.modified_time)
+            ext_ids.append(ext_index[f.extension])
+        
+        self.sizes = np.asarray(sizes, dtype=np.int64)
+        self.created = np.asarray(created, dtype=np.float64)
+        self.modified = np.asarray(modified, dtype=np.float64)
+        self.ext_ids = np.asarray(ext_ids, dtype=np.uint16 if len(self.extensions) > 256 else np.uint8)
+        self.path_lengths = np.fromiter((len(p) for p in self.paths), np.int64, len(self.paths))
+    
+    def __len__(self) -> int:
+        return len(self.paths)
+    
+    def __getitem__(self, index: int) -> FileInfo:
+        return self.files[index]
+    
+    @functools.cached_property
+    def _resolutions(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Read every file's resolution once: (widths, heights, resolved)."""
+        widths, heights, resolved = [], [], []
+        for f in self.files:
+            resolution = f.get_resolution()
+            width, height = resolution or (0, 0)
+            widths.append(width)
+            heights.append(height)
+            resolved.append(resolution is not None)
+        
+        return (np.asarray(widths, dtype=np.int32),
+                np.asarray(heights, dtype=np.int32),
+                np.asarray(resolved, dtype=bool))
+    
+    @property
+    def widths(self) -> np.ndarray:
+        """Image width of each file (0 where unknown)."""
+        return self._resolutions[0]
+    
+    @property
+    def heights(self) -> np.ndarray:
+        """Image height of each file (0 where unknown)."""
+        return self._resolutions[1]
+    
+    @property
+    def resolved(self) -> np.ndarray:
+        """Whether each file's resolution could be read."""
+        return self._resolutions[2]
+    
+    @functools.cached_property
+    def areas(self) -> np.ndarray:
+        """Pixel area of each file, or -1 where the resolution is unknown."""
+        return np.where(self.resolved, self.widths.astype(np.int64) * self.heights, -1)
+
+
 class FileScanner:
     """Scans directories for image files and collects metadata."""
     
-    def __init__(self, config_path: str = "config.json"):
+    def __init__(self, config_path: str = CONFIG_PATH):
         """
         Initialize the file scanner with configuration.
         
         Args:
             config_path: Path to configuration file
         """
+        self.config_path = config_path
         self.config = self._load_config(config_path)
-        self.supported_extensions = set(self.config.get('supported_extensions', []))
+        # Suffixes without the leading dot, matched against the text after the last '.'
+        self.supported_extensions = frozenset(
+            ext.lower().lstrip('.') for ext in self.config.get('supported_extensions', [])
+        )
+        
+        # One shared '.ext' string per supported suffix, so FileInfo objects
+        # reference an interned extension instead of each holding a copy
+        self._extension_names = {ext: sys.intern('.' + ext) for ext in self.supported_extensions}
         self.scan_options = self.config.get('scan_options', {})
+        self.scan_workers = (os.cpu_count() or 1) * 4
+        self.scan_processes = self.config.get('performance', {}).get('scan_processes', 0)
         self.files_scanned = 0
         self.errors = []
+        self.size_buckets = {}  # file size -> indices into the last scan's results
         
     def _load_config(self, config_path: str) -> dict:
-        """Load configuration from JSON file."""
+        """
+        Load configuration from JSON file, reusing the parse while it is unchanged.
+        
+        The file is rewritten before every scan, so the key includes the size
+        as well as the nanosecond mtime: two saves within one coarse timestamp
+        tick still differ unless they are the same length. Each scanner gets
+        its own copy, so changing it cannot affect later scans.
+        """
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.warning(f"Unable to load config from {config_path}: {e}. Using defaults.")
-            return {}
+            stat = os.stat(config_path)
+        except OSError:
+            return load_config(config_path)  # Logs the error and returns the defaults
+        
+        key = (config_path, stat.st_mtime_ns, stat.st_size)
+        if key not in _CONFIG_CACHE:
+            _CONFIG_CACHE[key] = load_config(config_path)
+        return copy.deepcopy(_CONFIG_CACHE[key])
     
     def scan_directories(self, 
                         root_paths: List[str], 
-                        progress_callback: Optional[Callable[[int, str], None]] = None) -> List[FileInfo]:
+                        progress_callback: Optional[Callable[[int, str], None]] = None,
+                        cancel_check: Optional[Callable[[], bool]] = None) -> List[FileInfo]:
         """
         Recursively scan directories for image files.
         
         Args:
             root_paths: List of root directory paths to scan
             progress_callback: Optional callback function(files_scanned, current_path)
+            cancel_check: Optional callable polled as directories complete;
+                once it returns True the scan stops without waiting for queued
+                directories and returns the files found so far
             
         Returns:
             List of FileInfo objects for all discovered image files
         """
-        logger.info(f"Starting scan of {len(root_paths)} root directories")
+        logger.info("Starting scan of %d root directories", len(root_paths))
         self.files_scanned = 0
         self.errors = []
+        self.size_buckets = {}
         
         all_files = []
-        scanned_paths: Set[str] = set()  # Avoid scanning same directory multiple times
+        normalized_paths = []
         
         for root_path in root_paths:
             if not os.path.exists(root_path):
@@ -92,106 +230,303 @@ class FileScanner:
                 self.errors.append(error_msg)
                 continue
             
-            # Normalize path to avoid duplicates
-            normalized_path = os.path.normpath(os.path.abspath(root_path))
-            
-            if normalized_path in scanned_paths:
-                logger.info(f"Skipping already scanned path: {root_path}")
-                continue
-            
-            scanned_paths.add(normalized_path)
-            files = self._scan_single_directory(normalized_path, progress_callback)
+            # Resolve symlinks so the same directory reached two ways is caught
+            normalized_paths.append(os.path.realpath(root_path))
+        
+        roots = self._remove_nested_roots(normalized_paths)
+        if self.scan_processes > 1 and len(roots) > 1:
+            results = self._scan_roots_in_processes(roots, progress_callback, cancel_check)
+        else:
+            results = (self._scan_single_directory(root_path, progress_callback, cancel_check) for root_path in roots)
+        
+        for files in results:
+            # Bucket by size as files arrive; a file with a unique size cannot be a duplicate
+            for index, file_info in enumerate(files, len(all_files)):
+                self.size_buckets.setdefault(file_info.size, []).append(index)
             all_files.extend(files)
+            
+            if cancel_check is not None and cancel_check():
+                logger.info("Scan cancelled after %d files", len(all_files))
+                break
         
-        logger.info(f"Scan complete. Found {len(all_files)} image files. Errors: {len(self.errors)}")
+        logger.info("Scan complete. Found %d image files. Errors: %d", len(all_files), len(self.errors))
         return all_files
     
+    def scan_root(self, root_path: str) -> List[FileInfo]:
+        """
+        Scan one root directory tree.
+        
+        This is the per-root step of scan_directories, without its path
+        checks, nested-root removal or size buckets; worker processes call it
+        through workers.scan_root_columns.
+        
+        Args:
+            root_path: Existing root directory to scan
+            
+        Returns:
+            List of FileInfo objects in traversal order; problems are
+            collected in self.errors
+        """
+        self.files_scanned = 0
+        self.errors = []
+        return self._scan_single_directory(root_path, None)
+    
+    def _scan_roots_in_processes(self, 
+                                 root_paths: List[str], 
+                                 progress_callback: Optional[Callable[[int, str], None]],
+                                 cancel_check: Optional[Callable[[], bool]] = None):
+        """
+        Scan each root in its own worker process.
+        
+        Workers return their files column-wise (see workers.scan_root_columns), so
+        each root crosses the process boundary as a few flat buffers rather
+        than one pickled object per file. Progress is reported per root.
+        
+        Yields:
+            List of FileInfo objects for each root, in order
+        """
+        workers = min(self.scan_processes, len(root_paths))
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+        finished = False
+        
+        try:
+            futures = [executor.submit(scan_root_columns, self.config_path, root_path) for root_path in root_paths]
+            
+            for root_path, future in zip(root_paths, futures):
+                # Wait in short steps, so a cancel is seen while a large root is still running
+                while not wait([future], timeout=CANCEL_POLL_INTERVAL).done:
+                    if cancel_check is not None and cancel_check():
+                        return
+                
+                columns = future.result()
+                files = [
+                    FileInfo(
+                        path=path,
+                        size=size,
+                        extension=self._extension_names[extension[1:]],
+                        resolution=None,
+                        created_time=created_time,
+                        modified_time=modified_time,
+                        _resolution_loaded=False
+                    )
+                    for path, extension, size, created_time, modified_time in zip(
+                        columns['paths'], columns['extensions'], columns['sizes'].tolist(),
+                        columns['created'].tolist(), columns['modified'].tolist()
+                    )
+                ]
+                self.errors.extend(columns['errors'])
+                self.files_scanned += len(files)
+                
+                if progress_callback:
+                    progress_callback(self.files_scanned, root_path)
+                yield files
+            
+            finished = True
+        finally:
+            # Cancelled or failed: drop queued roots and don't block on running ones
+            executor.shutdown(wait=finished, cancel_futures=True)
+    
+    def _remove_nested_roots(self, root_paths: List[str]) -> List[str]:
+        """
+        Drop roots that repeat, or lie inside, another root.
+        
+        Args:
+            root_paths: Resolved root directory paths
+            
+        Returns:
+            Roots to scan, in their original order
+        """
+        kept: Set[str] = set()
+        
+        # Shorter paths first, so a parent is kept before any of its children
+        for root_path in sorted(set(root_paths), key=len):
+            key = os.path.normcase(root_path)
+            is_nested = any(
+                key == parent or key.startswith(parent if parent.endswith(os.sep) else parent + os.sep)
+                for parent in kept
+            )
+            if is_nested:
+                logger.info("Skipping already scanned path: %s", root_path)
+            else:
+                kept.add(key)
+        
+        roots = []
+        for root_path in root_paths:
+            key = os.path.normcase(root_path)
+            if key in kept:
+                kept.discard(key)
+                roots.append(root_path)
+        return roots
+    
     def _scan_single_directory(self, 
                                root_path: str, 
-                               progress_callback: Optional[Callable[[int, str], None]]) -> List[FileInfo]:
-        """Scan a single directory tree."""
-        files = []
+                               progress_callback: Optional[Callable[[int, str], None]],
+                               cancel_check: Optional[Callable[[], bool]] = None) -> List[FileInfo]:
+        """
+        Scan a single directory tree.
+        
+        Each directory is listed by a worker thread and its subdirectories are
+        submitted as new tasks, so many directories are read concurrently.
+        Results are merged here, on the calling thread, which keeps
+        files_scanned, errors and progress reporting free of locking.
+        
+        Directories finish in no particular order, so each is tagged with its
+        position in the tree and the files are returned in traversal order
+        (a directory's files, then each subdirectory's, as os.walk would),
+        making the result the same from run to run.
+        """
+        last_progress = time.monotonic()
+        results = {}  # position in the tree -> (files, errors) of that directory
+        cancelled = False
+        
+        executor = ThreadPoolExecutor(max_workers=self.scan_workers)
+        pending = {executor.submit(self._scan_directory_entries, root_path): ()}
         
         try:
-            for dirpath, dirnames, filenames in os.walk(root_path):
-                # Filter out system/hidden folders if configured
-                if not self.scan_options.get('include_hidden_folders', False):
-                    dirnames[:] = [d for d in dirnames if not is_system_folder(os.path.join(dirpath, d))]
+            while pending and not cancelled:
+                # The timeout lets a cancel through even while no directory completes
+                done, _ = wait(pending, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                cancelled = cancel_check is not None and cancel_check()
                 
-                # Process files in current directory
-                for filename in filenames:
-                    file_path = os.path.join(dirpath, filename)
+                for future in done:
+                    position = pending.pop(future)
+                    dir_files, subdirs, errors = future.result()
+                    results[position] = (dir_files, errors)
+                    self.files_scanned += len(dir_files)
                     
-                    try:
-                        file_info = self._process_file(file_path)
-                        if file_info:
-                            files.append(file_info)
-                            self.files_scanned += 1
-                            
-                            # Call progress callback
-                            if progress_callback and self.files_scanned % 10 == 0:
-                                progress_callback(self.files_scanned, file_path)
+                    if cancelled:
+                        continue
+                    for index, subdir in enumerate(subdirs):
+                        pending[executor.submit(self._scan_directory_entries, subdir)] = position + (index,)
                     
-                    except Exception as e:
-                        error_msg = f"Error processing {file_path}: {e}"
-                        logger.warning(error_msg)
-                        self.errors.append(error_msg)
+                    # Call progress callback, at most once per PROGRESS_INTERVAL
+                    if progress_callback and dir_files and time.monotonic() - last_progress >= PROGRESS_INTERVAL:
+                        last_progress = time.monotonic()
+                        progress_callback(self.files_scanned, dir_files[-1].path)
+                    
+                    if cancel_check is not None and cancel_check():
+                        cancelled = True
+        except BaseException:
+            # The callback may raise to abort the scan; don't list queued directories
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        
+        # After a cancel, directories still being listed are left to finish on their own
+        executor.shutdown(wait=not cancelled, cancel_futures=True)
+        
+        files = []
+        for position in sorted(results):
+            dir_files, errors = results[position]
+            files.extend(dir_files)
+            self.errors.extend(errors)
+        return files
+    
+    def _scan_directory_entries(self, dirpath: str) -> Tuple[List[FileInfo], List[str], List[str]]:
+        """
+        List one directory (runs in a worker thread).
+        
+        Args:
+            dirpath: Directory to list
+            
+        Returns:
+            Tuple of (files found, subdirectories to scan, error messages)
+        """
+        files = []
+        subdirs = []
+        errors = []
+        
+        # Settings are fixed for the scan; bind them once rather than per entry
+        include_hidden = self.scan_options.get('include_hidden_folders', False)
+        min_size = self.scan_options.get('min_file_size_bytes', 0)
+        extension_names = self._extension_names
+        process_file = self._process_file
+        
+        try:
+            # Listing order depends on the filesystem; sort it so the scan
+            # order is the same everywhere
+            with os.scandir(dirpath) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
         
         except PermissionError as e:
-            error_msg = f"Permission denied accessing {root_path}: {e}"
+            error_msg = f"Permission denied accessing {dirpath}: {e}"
             logger.warning(error_msg)
-            self.errors.append(error_msg)
+            return files, subdirs, [error_msg]
         
         except Exception as e:
-            error_msg = f"Error scanning {root_path}: {e}"
+            error_msg = f"Error scanning {dirpath}: {e}"
             logger.error(error_msg)
-            self.errors.append(error_msg)
+            return files, subdirs, [error_msg]
         
-        return files
+        for entry in entries:
+            try:
+                # Like os.walk: symlinked directories are listed but not followed
+                if entry.is_dir():
+                    if entry.is_symlink():
+                        continue
+                    # Filter out system/hidden folders if configured
+                    if not include_hidden:
+                        # On Windows the listing already carries the attribute bits
+                        attributes = entry.stat(follow_symlinks=False).st_file_attributes if IS_WINDOWS else None
+                        if is_system_folder(entry.path, attributes):
+                            continue
+                    subdirs.append(entry.path)
+                    continue
+                
+                # Reject unsupported extensions before any stat or open
+                stem, dot, extension = entry.name.rpartition('.')
+                extension = extension_names.get(extension.lower())
+                if not stem or extension is None:
+                    continue
+                
+                file_info = process_file(entry.path, extension, entry.stat(), min_size)
+                if file_info:
+                    files.append(file_info)
+            
+            except Exception as e:
+                error_msg = f"Error processing {entry.path}: {e}"
+                logger.warning(error_msg)
+                errors.append(error_msg)
+        
+        return files, subdirs, errors
     
-    def _process_file(self, file_path: str) -> Optional[FileInfo]:
+    def _process_file(self, 
+                      file_path: str, 
+                      extension: str, 
+                      stat_result: os.stat_result, 
+                      min_size: int = 0) -> Optional[FileInfo]:
         """
         Process a single file and extract metadata.
         
+        The caller has already checked the extension is supported.
+        
         Args:
             file_path: Path to the file
+            extension: Lowercase file extension including the leading dot
+            stat_result: Stat of the file, as cached by os.scandir
+            min_size: Minimum file size in bytes
             
         Returns:
             FileInfo object or None if file should be skipped
         """
-        # Get file extension
-        _, extension = os.path.splitext(file_path)
-        extension = extension.lower()
-        
-        # Check if extension is supported
-        if extension not in self.supported_extensions:
-            return None
-        
-        # Get file size
-        try:
-            size = os.path.getsize(file_path)
-        except Exception as e:
-            logger.warning(f"Unable to get size for {file_path}: {e}")
-            return None
-        
         # Check minimum file size
-        min_size = self.scan_options.get('min_file_size_bytes', 0)
+        size = stat_result.st_size
         if size < min_size:
             return None
         
-        # Get image resolution
-        resolution = get_image_resolution(file_path)
-        
-        # Get file times
-        created_time, modified_time = get_file_times(file_path)
+        # Use the real creation time where the platform reports one
+        # (st_birthtime on Windows with Python 3.12+ and macOS); on Windows
+        # st_ctime is also the creation time
+        created_time = getattr(stat_result, 'st_birthtime', stat_result.st_ctime)
+        modified_time = stat_result.st_mtime
         
         return FileInfo(
             path=file_path,
             size=size,
             extension=extension,
-            resolution=resolution,
+            resolution=None,  # Read on demand by get_resolution()
             created_time=created_time,
-            modified_time=modified_time
+            modified_time=modified_time,
+            _resolution_loaded=False
         )
     
     def get_scan_summary(self) -> dict:
@@ -0,0 +1,194 @@
+"""
+Hamming distance helpers for Duplicate File Finder.
+Finds pairs of 64-bit perceptual hashes within a distance threshold.
+"""
+
+import os
+
+import numpy as np
+
+try:
+    from phash_sim import find_pairs  # Optional Cython build of phash_sim.pyx
+    PHASH_SIM_AVAILABLE = True
+except ImportError:
+    PHASH_SIM_AVAILABLE = False
+
+try:
+    import numba
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+    # The engine forks perceptual-hash workers after this kernel has run; a
+    # process that forked with TBB's worker threads started hangs at exit,
+    # so prefer the other layers unless NUMBA_THREADING_LAYER picked one
+    if 'NUMBA_THREADING_LAYER' not in os.environ:
+        numba.config.THREADING_LAYER_PRIORITY = ['omp', 'workqueue', 'tbb']
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+# Use the pigeonhole prefilter only when there are enough hashes to pay for
+# bucketing, and sub-keys are wide enough to split the hashes into useful buckets
+PIGEONHOLE_MIN_HASHES = 2048
+PIGEONHOLE_MIN_BITS = 8
+
+# Maximum entries in one block of the NumPy pairwise distance matrix
+TILE_ELEMENTS = 1 << 22
+
+
+def popcount64(values: np.ndarray) -> np.ndarray:
+    """Count set bits in each element of a uint64 NumPy array."""
+    if hasattr(np, 'bitwise_count'):  # NumPy 2.0+
+        return np.bitwise_count(values)
+    
+    # SWAR popcount for older NumPy versions
+    values = values - ((values >> np.uint64(1)) & _M1)
+    values = (values & _M2) + ((values >> np.uint64(2)) & _M2)
+    values = (values + (values >> np.uint64(4))) & _M4
+    return (values * _H01) >> np.uint64(56)
+
+
+def hamming_edges(hashes: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Find all pairs of hashes within a Hamming distance threshold.
+    
+    Large inputs are prefiltered with pigeonhole bucketing. Otherwise all
+    pairs are compared, using the compiled phash_sim extension if built, a
+    Numba kernel if numba is installed, or tiled NumPy broadcasts otherwise.
+    
+    Args:
+        hashes: 1-D uint64 array of packed 64-bit hashes
+        threshold: Maximum Hamming distance (inclusive)
+    
+    Returns:
+        (k, 2) int64 array of index pairs (i, j) with i < j
+    """
+    if len(hashes) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    
+    if len(hashes) >= PIGEONHOLE_MIN_HASHES and 64 // (threshold + 1) >= PIGEONHOLE_MIN_BITS:
+        return _pigeonhole_edges(hashes, threshold)
+    
+    if PHASH_SIM_AVAILABLE:
+        pairs = find_pairs(np.ascontiguousarray(hashes, dtype=np.uint64), threshold)
+        return np.array(pairs, dtype=np.int64).reshape(-1, 2)
+    
+    if NUMBA_AVAILABLE:
+        return _hamming_edges_numba(hashes, threshold)
+    
+    return _tiled_edges(hashes, threshold)
+
+
+def _tiled_edges(hashes: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Compare all pairs with NumPy, one block of rows at a time.
+    
+    Each block computes the XOR/popcount distances against every later hash
+    in a single broadcast, with the block height chosen so the intermediate
+    matrix stays under TILE_ELEMENTS entries.
+    """
+    n = len(hashes)
+    block = max(1, TILE_ELEMENTS // n)
+    edges = []
+    
+    for start in range(0, n - 1, block):
+        rows = hashes[start:start + block]
+        distances = popcount64(rows[:, None] ^ hashes[None, start:])
+        
+        # Keep the strict upper triangle (j > i) within the block
+        close = distances <= threshold
+        close &= np.arange(start, n)[None, :] > np.arange(start, start + len(rows))[:, None]
+        
+        i, j = np.nonzero(close)
+        if len(i):
+            edges.append(np.column_stack((i + start, j + start)))
+    
+    if not edges:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.concatenate(edges).astype(np.int64)
+
+
+def _pigeonhole_edges(hashes: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Find pairs within threshold by comparing only hashes that share a sub-key.
+    
+    The 64 bits are split into threshold + 1 disjoint sub-keys. Two hashes
+    that differ in at most threshold bits must agree exactly on at least one
+    sub-key, so comparing within sub-key buckets finds every pair.
+    
+    A skewed bucket (many blank or near-black images share sub-keys) would
+    need count^2 / 2 index pairs at once, so buckets with more pairs than
+    TILE_ELEMENTS are compared with _tiled_edges instead.
+    """
+    parts = threshold + 1
+    edges = []
+    shift = 0
+    
+    for part in range(parts):
+        width = 64 // parts + (1 if part < 64 % parts else 0)
+        sub_keys = (hashes >> np.uint64(shift)) & np.uint64((1 << width) - 1)
+        shift += width
+        
+        order = np.argsort(sub_keys, kind='stable')
+        _, starts, counts = np.unique(sub_keys[order], return_index=True, return_counts=True)
+        
+        for start, count in zip(starts[counts > 1].tolist(), counts[counts > 1].tolist()):
+            bucket = np.sort(order[start:start + count])
+            if count * (count - 1) // 2 > TILE_ELEMENTS:
+                # bucket is sorted, so local pairs (i < j) map to global pairs in order
+                local = _tiled_edges(hashes[bucket], threshold)
+                if len(local):
+                    edges.append(bucket[local])
+                continue
+            
+            left, right = np.triu_indices(count, 1)
+            left, right = bucket[left], bucket[right]
+            close = popcount64(hashes[left] ^ hashes[right]) <= threshold
+            if close.any():
+                edges.append(np.column_stack((left[close], right[close])))
+    
+    if not edges:
+        return np.empty((0, 2), dtype=np.int64)
+    
+    # A pair matching on several sub-keys is found once per bucket
+    return np.unique(np.concatenate(edges).astype(np.int64), axis=0)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _popcount_scalar(value):
+        value = value - ((value >> np.uint64(1)) & _M1)
+        value = (value & _M2) + ((value >> np.uint64(2)) & _M2)
+        value = (value + (value >> np.uint64(4))) & _M4
+        return (value * _H01) >> np.uint64(56)
+    
+    @njit(parallel=True, cache=True)
+    def _hamming_edges_numba(hashes, threshold):
+        n = hashes.shape[0]
+        
+        # First pass counts matches per row so the second pass can write
+        # edges into disjoint slices from parallel threads
+        counts = np.zeros(n, dtype=np.int64)
+        for i in prange(n):
+            count = 0
+            for j in range(i + 1, n):
+                if _popcount_scalar(hashes[i] ^ hashes[j]) <= threshold:
+                    count += 1
+            counts[i] = count
+        
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(counts)
+        
+        edges = np.empty((offsets[n], 2), dtype=np.int64)
+        for i in prange(n):
+            k = offsets[i]
+            for j in range(i + 1, n):
+                if _popcount_scalar(hashes[i] ^ hashes[j]) <= threshold:
+                    edges[k, 0] = i
+                    edges[k, 1] = j
+                    k += 1
+        
+        return edges
@@ -0,0 +1,122 @@
+"""
+Hash Cache for Duplicate File Finder.
+Persists file content hashes between scans in a SQLite database.
+"""
+
+import os
+import sqlite3
+from typing import Dict, List, Optional
+
+from logger import get_logger
+from utils import get_user_cache_dir
+
+logger = get_logger()
+
+
+def default_cache_path() -> str:
+    """Location of the hash cache when the config does not set one."""
+    return os.path.join(get_user_cache_dir(), 'duplicate-file-finder', 'hash_cache.sqlite')
+
+
+class HashCache:
+    """
+    On-disk memo of file hashes.
+    
+    Entries are keyed by file identity (device, inode) and hash algorithm, and
+    are only reused while the file's size and modification time are unchanged.
+    Use as a context manager, or call close(), to release the database.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Open (or create) the cache database.
+        
+        Args:
+            db_path: Path to the SQLite database file, or None for the
+                default location in the user cache directory
+        """
+        self.db_path = db_path or default_cache_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        # Opened per find_duplicates call and used only on the thread running it
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS hcache ("
+            "dev INTEGER, ino INTEGER, size INTEGER, mtime INTEGER, "
+            "algo TEXT, digest TEXT, PRIMARY KEY (dev, ino, algo))"
+        )
+        self.connection.commit()
+    
+    def get_many(self, file_paths: List[str], algorithm: str) -> Dict[str, str]:
+        """
+        Look up cached hashes for files that have not changed.
+        
+        Args:
+            file_paths: Paths to look up
+            algorithm: Hash algorithm the digest must have been computed with
+        
+        Returns:
+            Dictionary mapping path to cached digest (misses are omitted)
+        """
+        hits = {}
+        cursor = self.connection.cursor()
+        
+        for file_path in file_paths:
+            stat = self._stat(file_path)
+            if stat is None:
+                continue
+            
+            row = cursor.execute(
+                "SELECT digest, size, mtime FROM hcache WHERE dev = ? AND ino = ? AND algo = ?",
+                (stat.st_dev, stat.st_ino, algorithm)
+            ).fetchone()
+            
+            if row and row[1] == stat.st_size and row[2] == stat.st_mtime_ns:
+                hits[file_path] = row[0]
+        
+        return hits
+    
+    def put_many(self, digests: Dict[str, str], algorithm: str):
+        """
+        Store freshly computed hashes.
+        
+        Args:
+            digests: Dictionary mapping path to digest
+            algorithm: Hash algorithm used to compute the digests
+        """
+        rows = []
+        for file_path, digest in digests.items():
+            stat = self._stat(file_path)
+            if stat is None:
+                continue
+            rows.append((stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, algorithm, digest))
+        
+        if not rows:
+            return
+        
+        try:
+            self.connection.executemany("INSERT OR REPLACE INTO hcache VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.connection.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Unable to update hash cache: {e}")
+    
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+    
+    def __enter__(self) -> 'HashCache':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _stat(self, file_path: str) -> Optional[os.stat_result]:
+        """Stat a file, returning None if it has no usable identity."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        
+        # Some filesystems (e.g. FAT) report no inode number
+        if not stat.st_ino:
+            return None
+        return stat
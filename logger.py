@@ -3,9 +3,11 @@ Logging configuration for the Duplicate File Finder application.
 Provides both file and console logging with rotation support.
 """
 
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime
 
 
@@ -13,6 +15,9 @@ def setup_logger(name: str = "DuplicateFinder", log_dir: str = "logs") -> loggin
     """
     Configure and return a logger with file and console handlers.
     
+    Records are handed to the handlers through a queue, so threads that log
+    never block on file writes or rollover.
+    
     Args:
         name: Logger name
         log_dir: Directory to store log files
@@ -54,16 +59,23 @@ def setup_logger(name: str = "DuplicateFinder", log_dir: str = "logs") -> loggin
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
     
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # Logging threads only enqueue records; a listener thread does the writes
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    logger.addHandler(QueueHandler(log_queue))
     
     return logger
 
 
 def get_logger(name: str = "DuplicateFinder") -> logging.Logger:
     """
-    Get or create a logger instance.
+    Get a logger instance without configuring it.
+    
+    Handlers are only installed by an explicit setup_logger() call (as
+    main.py does), so importing a module as a library creates no log files.
     
     Args:
         name: Logger name
@@ -71,10 +83,7 @@ def get_logger(name: str = "DuplicateFinder") -> logging.Logger:
     Returns:
         Logger instance
     """
-    logger = logging.getLogger(name)
-    if not logger.handlers:
-        return setup_logger(name)
-    return logger
+    return logging.getLogger(name)
 
 
 # Convenience function for deletion logging
@@ -4,25 +4,25 @@ A safe and user-friendly tool for detecting and managing duplicate image files.
 """
 
 import sys
-import os
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtGui import QIcon
 
-from ui_main_window import MainWindow
 from logger import setup_logger
 
-# Initialize logger
-logger = setup_logger()
-
 
 def main():
     """Main application entry point."""
+    # Imported here rather than at module level: on spawn platforms (Windows)
+    # every worker process re-imports this module, and must not load Qt
+    from PyQt6.QtWidgets import QApplication
+    from ui_main_window import MainWindow
+    from styles import APP_STYLESHEET
+    
     logger.info("Starting Duplicate File Finder application")
     
     # Create application
     app = QApplication(sys.argv)
     app.setApplicationName("Duplicate File Finder")
     app.setOrganizationName("DuplicateFinder")
+    app.setStyleSheet(APP_STYLESHEET)
     
     # Create and show main window
     main_window = MainWindow()
@@ -36,6 +36,9 @@ def main():
 
 
 if __name__ == "__main__":
+    # Initialize logger (in the main process only)
+    logger = setup_logger()
+    
     try:
         main()
     except Exception as e:
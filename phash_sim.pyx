@@ -0,0 +1,46 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled pairwise Hamming search for perceptual hashes.
+
+Optional accelerator for hamming.hamming_edges. Build in place with:
+
+    cythonize -i phash_sim.pyx
+"""
+
+from libc.stdint cimport uint64_t
+
+cdef extern from *:
+    """
+    #if defined(_MSC_VER)
+    #include <intrin.h>
+    #define dff_popcount64(x) ((int)__popcnt64(x))
+    #else
+    #define dff_popcount64(x) __builtin_popcountll(x)
+    #endif
+    """
+    int dff_popcount64(uint64_t x) nogil
+
+
+def find_pairs(const uint64_t[::1] hashes, int threshold):
+    """
+    Find all index pairs (i, j), i < j, within threshold bits of each other.
+
+    Args:
+        hashes: Contiguous uint64 buffer of packed 64-bit hashes
+        threshold: Maximum Hamming distance (inclusive)
+
+    Returns:
+        List of (i, j) tuples
+    """
+    cdef Py_ssize_t n = hashes.shape[0]
+    cdef Py_ssize_t i, j
+    cdef uint64_t current
+    cdef list pairs = []
+
+    for i in range(n):
+        current = hashes[i]
+        for j in range(i + 1, n):
+            if dff_popcount64(current ^ hashes[j]) <= threshold:
+                pairs.append((i, j))
+
+    return pairs
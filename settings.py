@@ -0,0 +1,95 @@
+"""
+Configuration defaults for Duplicate File Finder.
+Loads config.json and fills in any section or option it is missing.
+"""
+
+import copy
+import json
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from logger import get_logger
+
+logger = get_logger()
+
+CONFIG_PATH = "config.json"
+
+# Mirrors the shipped config.json; used for anything the file does not set
+DEFAULT_CONFIG = {
+    "supported_extensions": [".jpg", ".jpeg", ".png", ".heic", ".webp", ".gif", ".bmp"],
+    "scan_options": {
+        "include_hidden_folders": False,
+        "include_system_folders": False,
+        "min_file_size_bytes": 1024
+    },
+    "suggestion_strategy": "keep_highest_resolution",
+    "ui_preferences": {
+        "thumbnail_size": 150,
+        "theme": "light"
+    },
+    "performance": {
+        "max_worker_threads": 4,
+        "hash_chunk_size_kb": 1024,
+        "hash_algorithm": "blake3",
+        "io_queue_depth": 32,
+        "scan_processes": 0
+    },
+    "hash_cache": {
+        "enabled": True
+    },
+    "perceptual_hash": {
+        "enabled": False,
+        "similarity_threshold": 5
+    }
+}
+
+
+def merge_defaults(config: dict) -> dict:
+    """
+    Complete a config with the defaults for anything it leaves out.
+    
+    Sections that are dictionaries are merged option by option, so a file
+    that sets one performance option keeps the defaults for the others.
+    
+    Args:
+        config: Parsed config file contents
+    
+    Returns:
+        New dictionary with every default section present
+    """
+    merged = copy.deepcopy(DEFAULT_CONFIG)
+    for key, value in config.items():
+        if isinstance(merged.get(key), dict):
+            # A section that is not an object is ignored rather than trusted
+            if isinstance(value, dict):
+                merged[key].update(value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_config(config_path: str = CONFIG_PATH) -> dict:
+    """
+    Load the config file, completed with the defaults.
+    
+    Args:
+        config_path: Path to configuration file
+    
+    Returns:
+        Configuration dictionary; just the defaults if the file could not
+        be read or parsed
+    """
+    try:
+        with open(config_path, 'rb') as f:
+            data = f.read()
+        config = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+        if not isinstance(config, dict):
+            raise ValueError("top level is not an object")
+    except Exception as e:
+        logger.warning(f"Unable to load config from {config_path}: {e}. Using defaults.")
+        config = {}
+    return merge_defaults(config)
@@ -0,0 +1,117 @@
+"""
+Application stylesheet for Duplicate File Finder.
+Applied once to the QApplication; widgets opt in by object name.
+"""
+
+APP_STYLESHEET = """
+QPushButton#scanButton {
+    background-color: #4CAF50;
+    color: white;
+    font-size: 14px;
+    font-weight: bold;
+    border-radius: 5px;
+}
+QPushButton#scanButton:hover {
+    background-color: #45a049;
+}
+QPushButton#scanButton:disabled {
+    background-color: #cccccc;
+}
+
+QPushButton#loadResultsButton {
+    background-color: #2196F3;
+    color: white;
+    font-size: 14px;
+    font-weight: bold;
+    border-radius: 5px;
+}
+QPushButton#loadResultsButton:hover {
+    background-color: #0b7dda;
+}
+
+QLabel#helpLabel {
+    color: #666;
+    font-size: 10px;
+}
+
+QLabel#deleteWarningLabel {
+    color: #f44336;
+}
+QLabel#hardDeleteLabel {
+    color: #f44336;
+    font-weight: bold;
+}
+
+QPushButton#confirmDeleteButton {
+    background-color: #f44336;
+    color: white;
+    font-weight: bold;
+    padding: 10px 20px;
+    border-radius: 5px;
+}
+QPushButton#confirmDeleteButton:hover {
+    background-color: #da190b;
+}
+
+QGroupBox#duplicateGroup {
+    font-size: 13px;
+    font-weight: bold;
+    border: 2px solid #555;
+    border-radius: 8px;
+    margin-top: 12px;
+    padding-top: 15px;
+    background-color: #2b2b2b;
+}
+QGroupBox#duplicateGroup::title {
+    subcontrol-origin: margin;
+    left: 15px;
+    padding: 0 10px;
+    color: #4CAF50;
+}
+
+QTableWidget#groupTable {
+    background-color: #1e1e1e;
+    alternate-background-color: #252525;
+    gridline-color: #404040;
+    font-size: 11px;
+}
+QTableWidget#groupTable::item {
+    padding: 5px;
+}
+QTableWidget#groupTable QHeaderView::section {
+    background-color: #333;
+    color: white;
+    font-weight: bold;
+    padding: 8px;
+    border: 1px solid #555;
+}
+
+QLabel#keepHintLabel {
+    color: #4CAF50;
+    font-weight: bold;
+    font-size: 11px;
+}
+
+QPushButton#keepSuggestedButton {
+    background-color: #4CAF50;
+    color: white;
+    padding: 8px 15px;
+    border-radius: 4px;
+    font-weight: bold;
+}
+QPushButton#keepSuggestedButton:hover {
+    background-color: #45a049;
+}
+
+QPushButton#deleteSelectedButton {
+    background-color: #f44336;
+    color: white;
+    font-size: 14px;
+    font-weight: bold;
+    border-radius: 5px;
+    padding: 0 20px;
+}
+QPushButton#deleteSelectedButton:hover {
+    background-color: #da190b;
+}
+"""
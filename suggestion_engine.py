@@ -3,8 +3,11 @@ Suggestion Engine for Duplicate File Finder.
 Helps users decide which file to keep in duplicate groups.
 """
 
-from typing import List, Tuple
-from file_scanner import FileInfo
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from file_scanner import FileInfo, FileTable
 from logger import get_logger
 
 logger = get_logger()
@@ -29,16 +32,25 @@ class SuggestionEngine:
             preferred_folders: List of folder paths in priority order
         """
         self.preferred_folders = preferred_folders or []
+        
+        # Case-folded folder patterns with display names, prepared once
+        self._preferred_lower = [
+            (preferred.lower(), preferred.split('\\')[-1].split('/')[-1])
+            for preferred in self.preferred_folders
+        ]
     
     def suggest_keeper(self, 
                       files: List[FileInfo], 
-                      strategy: str = 'keep_highest_resolution') -> Tuple[FileInfo, str]:
+                      strategy: str = 'keep_highest_resolution',
+                      table: Optional[FileTable] = None) -> Tuple[FileInfo, str]:
         """
         Suggest which file to keep based on strategy.
         
         Args:
             files: List of duplicate FileInfo objects
             strategy: Strategy name
+            table: FileTable of files, e.g. DuplicateGroup.table; built
+                here if not given
             
         Returns:
             Tuple of (suggested_file, reason_string)
@@ -49,72 +61,77 @@ class SuggestionEngine:
         if len(files) == 1:
             return files[0], "Only one file"
         
+        if table is None:
+            table = FileTable(files)
+        
         if strategy == 'keep_oldest':
-            return self._suggest_oldest(files)
+            return self._suggest_oldest(table)
         
         elif strategy == 'keep_newest':
-            return self._suggest_newest(files)
+            return self._suggest_newest(table)
         
         elif strategy == 'keep_highest_resolution':
-            return self._suggest_highest_resolution(files)
+            return self._suggest_highest_resolution(table)
         
         elif strategy == 'keep_shortest_path':
-            return self._suggest_shortest_path(files)
+            return self._suggest_shortest_path(table)
         
         elif strategy == 'keep_preferred_folder':
-            return self._suggest_preferred_folder(files)
+            return self._suggest_preferred_folder(table)
         
         else:
-            logger.warning(f"Unknown strategy: {strategy}. Using first file.")
+            logger.warning("Unknown strategy: %s. Using first file.", strategy)
             return files[0], "Default (unknown strategy)"
     
-    def _suggest_oldest(self, files: List[FileInfo]) -> Tuple[FileInfo, str]:
+    def _suggest_oldest(self, table: FileTable) -> Tuple[FileInfo, str]:
         """Suggest the oldest file by creation time."""
-        oldest = min(files, key=lambda f: f.created_time)
+        oldest = table.files[int(table.created.argmin())]
         from datetime import datetime
         date_str = datetime.fromtimestamp(oldest.created_time).strftime('%Y-%m-%d %H:%M')
         return oldest, f"Oldest (created {date_str})"
     
-    def _suggest_newest(self, files: List[FileInfo]) -> Tuple[FileInfo, str]:
+    def _suggest_newest(self, table: FileTable) -> Tuple[FileInfo, str]:
         """Suggest the newest file by creation time."""
-        newest = max(files, key=lambda f: f.created_time)
+        newest = table.files[int(table.created.argmax())]
         from datetime import datetime
         date_str = datetime.fromtimestamp(newest.created_time).strftime('%Y-%m-%d %H:%M')
         return newest, f"Newest (created {date_str})"
     
-    def _suggest_highest_resolution(self, files: List[FileInfo]) -> Tuple[FileInfo, str]:
+    def _suggest_highest_resolution(self, table: FileTable) -> Tuple[FileInfo, str]:
         """Suggest the file with highest resolution."""
-        # Filter files with valid resolution
-        files_with_res = [f for f in files if f.resolution and f.resolution[0] > 0]
+        # Files without a valid resolution get area -1
+        areas = np.where(table.widths > 0, table.areas, -1)
+        best = int(areas.argmax())
         
-        if not files_with_res:
+        if areas[best] < 0:
             # Fallback to oldest if no resolution info
-            return self._suggest_oldest(files)
+            return self._suggest_oldest(table)
         
-        # Find highest resolution by area (width * height)
-        highest = max(files_with_res, key=lambda f: f.resolution[0] * f.resolution[1])
-        return highest, f"Highest resolution ({highest.resolution[0]}×{highest.resolution[1]})"
+        # Highest resolution by area (width * height)
+        highest = table.files[best]
+        width, height = highest.get_resolution()
+        return highest, f"Highest resolution ({width}×{height})"
     
-    def _suggest_shortest_path(self, files: List[FileInfo]) -> Tuple[FileInfo, str]:
+    def _suggest_shortest_path(self, table: FileTable) -> Tuple[FileInfo, str]:
         """Suggest the file with shortest path (closer to root)."""
-        shortest = min(files, key=lambda f: len(f.path))
+        shortest = table.files[int(table.path_lengths.argmin())]
         return shortest, f"Shortest path ({len(shortest.path)} chars)"
     
-    def _suggest_preferred_folder(self, files: List[FileInfo]) -> Tuple[FileInfo, str]:
+    def _suggest_preferred_folder(self, table: FileTable) -> Tuple[FileInfo, str]:
         """Suggest file based on preferred folder priority."""
         if not self.preferred_folders:
             # Fallback to highest resolution
-            return self._suggest_highest_resolution(files)
+            return self._suggest_highest_resolution(table)
         
-        # Check each preferred folder in priority order
-        for preferred in self.preferred_folders:
-            for file_info in files:
-                if preferred.lower() in file_info.path.lower():
-                    folder_name = preferred.split('\\')[-1].split('/')[-1]
+        # Lowercase each path once, then check preferred folders in priority order
+        paths_lower = [path.lower() for path in table.paths]
+        for preferred_lower, folder_name in self._preferred_lower:
+            for file_info, path_lower in zip(table.files, paths_lower):
+                if preferred_lower in path_lower:
                     return file_info, f"In preferred folder ({folder_name})"
         
         # If no match, fallback to highest resolution
-        return self._suggest_highest_resolution(files)
+        return self._suggest_highest_resolution(table)
     
     def get_files_to_delete(self, 
                            files: List[FileInfo], 
@@ -72,6 +72,31 @@ except Exception as e:
 
 print()
 
+# Test 2b: Nested root removal
+print("Test 2b: Testing nested root removal...")
+try:
+    parent = os.path.join(test_dir, "photos")
+    roots = [
+        os.path.join(parent, "2024"),
+        parent,
+        parent + "_backup",  # Shares a prefix but is not inside parent
+        parent,
+    ]
+    
+    kept = FileScanner()._remove_nested_roots(roots)
+    assert kept == [parent, parent + "_backup"], f"Unexpected roots: {kept}"
+    
+    # Scanning the same root twice must not report its files twice
+    repeat_files = FileScanner().scan_directories([test_dir, test_dir])
+    assert len(repeat_files) == 6, f"Expected 6 files, found {len(repeat_files)}"
+    print("  ✓ Nested root removal test PASSED")
+except Exception as e:
+    print(f"  ✗ Nested root removal test FAILED: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
 # Test 3: Deduplication Engine
 print("Test 3: Testing Deduplication Engine...")
 try:
@@ -102,6 +127,178 @@ except Exception as e:
 
 print()
 
+# Test 3b: Partial-hash pre-filter
+print("Test 3b: Testing head/tail pre-filter...")
+try:
+    probe_dir = os.path.join(test_dir, "probe")
+    os.makedirs(probe_dir, exist_ok=True)
+    
+    # Same size, head and tail; only the middle byte differs
+    for name, middle in [("mid_a_0.jpg", b"X"), ("mid_a_1.jpg", b"X"), ("mid_b.jpg", b"Y")]:
+        with open(os.path.join(probe_dir, name), 'wb') as f:
+            f.write(b"A" * 5000 + middle + b"A" * 5000)
+    
+    probe_files = FileScanner().scan_directories([probe_dir])
+    probe_groups = DeduplicationEngine().find_duplicates(probe_files, use_perceptual=False)
+    
+    assert len(probe_groups) == 1, f"Expected 1 group, found {len(probe_groups)}"
+    probe_names = sorted(os.path.basename(f.path) for f in probe_groups[0].files)
+    assert probe_names == ["mid_a_0.jpg", "mid_a_1.jpg"], f"Unexpected group: {probe_names}"
+    
+    shutil.rmtree(probe_dir)
+    print("  ✓ Head/tail pre-filter test PASSED")
+except Exception as e:
+    print(f"  ✗ Head/tail pre-filter test FAILED: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 3c: Perceptual clustering
+print("Test 3c: Testing perceptual clustering...")
+try:
+    from PIL import Image
+    
+    similar_dir = os.path.join(test_dir, "similar")
+    os.makedirs(similar_dir, exist_ok=True)
+    
+    # 8x8 block patterns: B is 3 cells away from A, C is 3 from B and 6 from A
+    white_cells = {
+        "chain_a.bmp": set(range(32)),
+        "chain_b.bmp": set(range(3, 32)),
+        "chain_c.bmp": set(range(6, 32)),
+    }
+    for name, cells in white_cells.items():
+        img = Image.new('L', (64, 64), 0)
+        for cell in cells:
+            x, y = (cell % 8) * 8, (cell // 8) * 8
+            img.paste(255, (x, y, x + 8, y + 8))
+        img.convert('RGB').save(os.path.join(similar_dir, name))
+    
+    similar_files = FileScanner().scan_directories([similar_dir])
+    similar_groups = DeduplicationEngine().find_duplicates(similar_files, use_perceptual=True)
+    
+    # Threshold is 5: A and C only match through B
+    assert len(similar_groups) == 1, f"Expected 1 group, found {len(similar_groups)}"
+    assert len(similar_groups[0].files) == 3, "Transitively similar images should be grouped"
+    
+    shutil.rmtree(similar_dir)
+    print("  ✓ Perceptual clustering test PASSED")
+except Exception as e:
+    print(f"  ✗ Perceptual clustering test FAILED: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 3d: Perceptual hashing in worker processes
+print("Test 3d: Testing perceptual hashing in worker processes...")
+try:
+    import random
+    from deduplication_engine import PHASH_PROCESS_MIN_FILES
+    
+    pool_dir = os.path.join(test_dir, "pool")
+    os.makedirs(pool_dir, exist_ok=True)
+    
+    # Enough images for the process pool: pairs of one random 8x8 block
+    # pattern, the second copy with one pixel changed (same hash, new bytes)
+    rng = random.Random(7)
+    pair_count = PHASH_PROCESS_MIN_FILES // 2 + 1
+    for pair in range(pair_count):
+        img = Image.new('L', (64, 64), 0)
+        for cell in rng.sample(range(64), 32):
+            x, y = (cell % 8) * 8, (cell // 8) * 8
+            img.paste(255, (x, y, x + 8, y + 8))
+        img.convert('RGB').save(os.path.join(pool_dir, f"pair{pair}_a.bmp"))
+        img.putpixel((0, 0), 128)
+        img.convert('RGB').save(os.path.join(pool_dir, f"pair{pair}_b.bmp"))
+    
+    pool_files = FileScanner().scan_directories([pool_dir])
+    assert len(pool_files) >= PHASH_PROCESS_MIN_FILES, "Too few images to use worker processes"
+    pool_groups = DeduplicationEngine().find_duplicates(pool_files, use_perceptual=True)
+    
+    assert len(pool_groups) == pair_count, f"Expected {pair_count} groups, found {len(pool_groups)}"
+    for group in pool_groups:
+        names = sorted(os.path.basename(f.path).split('_')[0] for f in group.files)
+        assert len(names) == 2 and names[0] == names[1], f"Unexpected group: {names}"
+    
+    shutil.rmtree(pool_dir)
+    print("  ✓ Worker process perceptual hashing test PASSED")
+except Exception as e:
+    print(f"  ✗ Worker process perceptual hashing test FAILED: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 3e: Hash cache reuse and invalidation
+print("Test 3e: Testing hash cache...")
+try:
+    from hash_cache import HashCache
+    
+    cached_path = os.path.join(test_dir, "cached.jpg")
+    with open(cached_path, 'wb') as f:
+        f.write(b"cached" * 1000)
+    
+    with HashCache(os.path.join(test_dir, "hash_cache.sqlite")) as cache:
+        cache.put_many({cached_path: "digest"}, "blake3")
+        assert cache.get_many([cached_path], "blake3") == {cached_path: "digest"}, "Unchanged file should hit"
+        assert cache.get_many([cached_path], "sha256") == {}, "Other algorithm should miss"
+        
+        # A rewrite changes size and mtime, so the stored digest is stale
+        with open(cached_path, 'ab') as f:
+            f.write(b"changed")
+        assert cache.get_many([cached_path], "blake3") == {}, "Modified file should miss"
+    
+    os.remove(cached_path)
+    print("  ✓ Hash cache test PASSED")
+except Exception as e:
+    print(f"  ✗ Hash cache test FAILED: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 3f: Hamming edge search strategies
+print("Test 3f: Testing Hamming edge strategies...")
+try:
+    import numpy as np
+    import hamming
+    
+    # Clusters of hashes a few bits apart, enough to take the pigeonhole path
+    edge_rng = np.random.default_rng(7)
+    centers = edge_rng.integers(0, 2**63, size=600, dtype=np.uint64)
+    flips = np.uint64(1) << edge_rng.integers(0, 64, size=(600, 4)).astype(np.uint64)
+    hashes = np.concatenate([centers] + [centers ^ flips[:, k] for k in range(4)])
+    hashes = np.concatenate([hashes, np.zeros(64, dtype=np.uint64)])  # One oversized bucket
+    assert len(hashes) >= hamming.PIGEONHOLE_MIN_HASHES, "Too few hashes for the pigeonhole path"
+    
+    def edge_set(edges):
+        return set(map(tuple, edges.tolist()))
+    
+    expected = edge_set(hamming._tiled_edges(hashes, 5))
+    assert expected, "Test hashes should produce edges"
+    assert edge_set(hamming._pigeonhole_edges(hashes, 5)) == expected, "Pigeonhole edges differ"
+    
+    # Force every shared bucket through the tiled fallback
+    tile_elements = hamming.TILE_ELEMENTS
+    hamming.TILE_ELEMENTS = 1
+    try:
+        assert edge_set(hamming._pigeonhole_edges(hashes, 5)) == expected, "Tiled bucket edges differ"
+    finally:
+        hamming.TILE_ELEMENTS = tile_elements
+    
+    if hamming.NUMBA_AVAILABLE:
+        assert edge_set(hamming._hamming_edges_numba(hashes, 5)) == expected, "Numba edges differ"
+    assert edge_set(hamming.hamming_edges(hashes, 5)) == expected, "hamming_edges differs"
+    print("  ✓ Hamming edge strategies test PASSED")
+except Exception as e:
+    print(f"  ✗ Hamming edge strategies test FAILED: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
 # Test 4: Suggestion Engine
 print("Test 4: Testing Suggestion Engine...")
 try:
@@ -114,7 +311,8 @@ try:
     print(f"  ✓ Suggestion (keep_oldest): {os.path.basename(keeper.path)}")
     print(f"    Reason: {reason}")
     
-    keeper2, reason2 = engine.suggest_keeper(duplicate_groups[0].files, 'keep_shortest_path')
+    keeper2, reason2 = engine.suggest_keeper(duplicate_groups[0].files, 'keep_shortest_path',
+                                             duplicate_groups[0].table)
     print(f"  ✓ Suggestion (keep_shortest_path): {os.path.basename(keeper2.path)}")
     print(f"    Reason: {reason2}")
     
@@ -131,7 +329,8 @@ print("Test 5: Testing Deletion Manager (Dry Run)...")
 try:
     from deletion_manager import DeletionManager, DeletionMethod
     
-    manager = DeletionManager()
+    # Keep deletion logs out of the working directory
+    manager = DeletionManager(log_dir=os.path.join(test_dir, "deletion_logs"))
     
     # Get files to delete from first group
     files_to_delete = duplicate_groups[0].files[:2]  # Delete 2 out of 3
@@ -163,6 +362,56 @@ except Exception as e:
 
 print()
 
+# Test 5b: Recycle bin batch fallback
+print("Test 5b: Testing recycle bin batch fallback...")
+try:
+    import deletion_manager
+    
+    trash_dir = os.path.join(test_dir, "trash")
+    os.makedirs(trash_dir, exist_ok=True)
+    trash_paths = []
+    for i in range(4):
+        path = os.path.join(trash_dir, f"trash_{i}.jpg")
+        with open(path, 'wb') as f:
+            f.write(b"trash" * 100)
+        trash_paths.append(path)
+    stuck_path = trash_paths[2]
+    
+    # Stand-in recycle bin: the batch call moves one file and then fails,
+    # and stuck_path cannot be moved on its own either
+    def fake_send2trash(paths):
+        if isinstance(paths, list):
+            os.remove(paths[0])
+            raise OSError("batch failed")
+        if paths == stuck_path:
+            raise OSError("stuck")
+        os.remove(paths)
+    
+    real_send2trash = deletion_manager._send2trash
+    real_available = deletion_manager.SEND2TRASH_AVAILABLE
+    deletion_manager._send2trash = fake_send2trash
+    deletion_manager.SEND2TRASH_AVAILABLE = True
+    try:
+        report = manager.delete_files(trash_paths, DeletionMethod.RECYCLE_BIN)
+    finally:
+        deletion_manager._send2trash = real_send2trash
+        deletion_manager.SEND2TRASH_AVAILABLE = real_available
+    
+    outcomes = {os.path.basename(r.file_path): (r.success, r.error) for r in report.results}
+    assert [r.file_path for r in report.results] == trash_paths, "Results should follow input order"
+    assert outcomes["trash_2.jpg"] == (False, "stuck"), f"Failure not attributed: {outcomes}"
+    assert report.successful_deletions == 3, f"Unexpected outcomes: {outcomes}"
+    assert os.listdir(trash_dir) == ["trash_2.jpg"], "Only the stuck file should remain"
+    
+    shutil.rmtree(trash_dir)
+    print("  ✓ Recycle bin batch fallback test PASSED")
+except Exception as e:
+    print(f"  ✗ Recycle bin batch fallback test FAILED: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
 # Cleanup
 print("Cleaning up test files...")
 try:
@@ -3,28 +3,78 @@ Dialog windows for Duplicate File Finder.
 Includes confirmation dialogs and other UI dialogs.
 """
 
-from typing import List, Tuple
+import functools
+from typing import List, Optional, Tuple
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QRadioButton, QButtonGroup, QTextEdit, QLineEdit, QMessageBox
+    QRadioButton, QButtonGroup, QListView, QAbstractItemView, QLineEdit, QMessageBox, QWidget
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QStringListModel
 from PyQt6.QtGui import QFont
 
-from file_scanner import FileInfo
 from deletion_manager import DeletionMethod
 from utils import format_bytes
 
+# Number of paths listed in the deletion confirmation dialog
+DELETION_PREVIEW_LIMIT = 50
+
+
+@functools.lru_cache(maxsize=None)
+def bold_font(point_size: Optional[int] = None) -> QFont:
+    """
+    Get a shared bold font, created on first use.
+    
+    QFont is implicitly shared, so handing the same instance to many
+    widgets only bumps a reference count.
+    
+    Args:
+        point_size: Font size in points, or None for the default size
+    """
+    font = QFont()
+    if point_size is not None:
+        font.setPointSize(point_size)
+    font.setBold(True)
+    return font
+
 
 class DeletionConfirmationDialog(QDialog):
     """Dialog to confirm file deletion with safety checks."""
     
-    def __init__(self, files: List[FileInfo], parent=None):
+    def __init__(self, count: int, total_size: int, preview_paths: List[str], parent=None):
+        """
+        Args:
+            count: Number of files to delete
+            total_size: Combined size of the files in bytes
+            preview_paths: Paths of the first files, at most DELETION_PREVIEW_LIMIT
+            parent: Parent widget
+        """
         super().__init__(parent)
-        self.files = files
+        self.init_ui()
+        self.reset(count, total_size, preview_paths)
+    
+    def reset(self, count: int, total_size: int, preview_paths: List[str]):
+        """
+        Show a new set of files and clear the previous answer, so an existing
+        dialog can be reopened instead of building a new one.
+        
+        Args:
+            count: Number of files to delete
+            total_size: Combined size of the files in bytes
+            preview_paths: Paths of the first files, at most DELETION_PREVIEW_LIMIT
+        """
+        self.count = count
+        self.total_size = total_size
+        self.preview_paths = preview_paths
         self.confirmed = False
         self.selected_method = DeletionMethod.RECYCLE_BIN
-        self.init_ui()
+        
+        self.summary_label.setText(f"Files to delete: {count}\nTotal size: {format_bytes(total_size)}")
+        self.preview_model.setStringList(preview_paths)
+        self.more_label.setText(f"... and {count - len(preview_paths)} more files")
+        self.more_label.setVisible(count > len(preview_paths))
+        
+        self.recycle_radio.setChecked(True)
+        self.confirmation_input.clear()
     
     def init_ui(self):
         """Initialize the UI."""
@@ -36,39 +86,35 @@ class DeletionConfirmationDialog(QDialog):
         
         # Warning label
         warning_label = QLabel("⚠️ You are about to delete files")
-        warning_font = QFont()
-        warning_font.setPointSize(14)
-        warning_font.setBold(True)
-        warning_label.setFont(warning_font)
-        warning_label.setStyleSheet("color: #f44336;")
+        warning_label.setFont(bold_font(14))
+        warning_label.setObjectName("deleteWarningLabel")
         layout.addWidget(warning_label)
         
         # Summary
-        total_size = sum(f.size for f in self.files)
-        summary_label = QLabel(
-            f"<b>Files to delete:</b> {len(self.files)}<br>"
-            f"<b>Total size:</b> {format_bytes(total_size)}"
-        )
-        layout.addWidget(summary_label)
+        # Text is set by reset() as one string; plain text keeps Qt from running its rich-text parser
+        self.summary_label = QLabel()
+        self.summary_label.setTextFormat(Qt.TextFormat.PlainText)
+        self.summary_label.setFont(bold_font())
+        layout.addWidget(self.summary_label)
         
         # File list
         list_label = QLabel("Files:")
         layout.addWidget(list_label)
         
-        file_list = QTextEdit()
-        file_list.setReadOnly(True)
+        file_list = QListView()
+        file_list.setUniformItemSizes(True)
+        file_list.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         file_list.setMaximumHeight(200)
-        file_text = "\n".join(f.path for f in self.files[:50])  # Limit to 50
-        if len(self.files) > 50:
-            file_text += f"\n... and {len(self.files) - 50} more files"
-        file_list.setPlainText(file_text)
+        self.preview_model = QStringListModel(file_list)
+        file_list.setModel(self.preview_model)
         layout.addWidget(file_list)
         
+        self.more_label = QLabel()
+        layout.addWidget(self.more_label)
+        
         # Deletion method selection
         method_label = QLabel("Deletion method:")
-        method_font = QFont()
-        method_font.setBold(True)
-        method_label.setFont(method_font)
+        method_label.setFont(bold_font())
         layout.addWidget(method_label)
         
         self.method_group = QButtonGroup()
@@ -89,7 +135,7 @@ class DeletionConfirmationDialog(QDialog):
         confirmation_layout.setContentsMargins(20, 0, 0, 0)
         
         confirm_label = QLabel('To confirm permanent deletion, type "DELETE" below:')
-        confirm_label.setStyleSheet("color: #f44336; font-weight: bold;")
+        confirm_label.setObjectName("hardDeleteLabel")
         confirmation_layout.addWidget(confirm_label)
         
         self.confirmation_input = QLineEdit()
@@ -112,18 +158,7 @@ class DeletionConfirmationDialog(QDialog):
         button_layout.addStretch()
         
         self.confirm_btn = QPushButton("Confirm Deletion")
-        self.confirm_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                font-weight: bold;
-                padding: 10px 20px;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #da190b;
-            }
-        """)
+        self.confirm_btn.setObjectName("confirmDeleteButton")
         self.confirm_btn.clicked.connect(self.on_confirm)
         button_layout.addWidget(self.confirm_btn)
         
@@ -198,10 +233,7 @@ class AboutDialog(QDialog):
         
         # Title
         title_label = QLabel("Duplicate File Finder")
-        title_font = QFont()
-        title_font.setPointSize(16)
-        title_font.setBold(True)
-        title_label.setFont(title_font)
+        title_label.setFont(bold_font(16))
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title_label)
         
@@ -222,6 +254,7 @@ class AboutDialog(QDialog):
             "• Comprehensive logging and error handling\n\n"
             "Built with Python and PyQt6"
         )
+        description.setTextFormat(Qt.TextFormat.PlainText)
         description.setWordWrap(True)
         description.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(description)
@@ -5,46 +5,102 @@ Provides the primary user interface for folder selection and scanning.
 
 import sys
 import os
-from typing import List
+from typing import List, Optional, Tuple
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QListWidget, QLabel, QProgressBar, QCheckBox, QFileDialog,
+    QListView, QLabel, QProgressBar, QCheckBox, QFileDialog,
     QGroupBox, QMessageBox, QSlider, QSpinBox
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QFont
+from PyQt6.QtCore import (
+    Qt, QObject, QThread, QStringListModel, QTimer, QMutex, QMutexLocker,
+    QSaveFile, QIODevice, pyqtSignal, pyqtSlot
+)
 
 from file_scanner import FileScanner, FileInfo
 from deduplication_engine import DeduplicationEngine, DuplicateGroup
 from ui_results_view import ResultsView
+from ui_dialogs import bold_font
+from settings import CONFIG_PATH, load_config
+from utils import format_bytes
 from logger import get_logger
 import json
 
 logger = get_logger()
 
+# Interval at which the main window refreshes scan progress
+PROGRESS_POLL_MS = 50
+
+
+def save_config(config_data: bytes, config_path: str = CONFIG_PATH):
+    """
+    Atomically replace the config file.
+    
+    QSaveFile writes to a temporary file and renames it over the target on
+    commit, so readers never see a partially written config.
+    
+    Args:
+        config_data: Serialized JSON config
+        config_path: Path to configuration file
+    """
+    save_file = QSaveFile(config_path)
+    if not save_file.open(QIODevice.OpenModeFlag.WriteOnly):
+        logger.warning(f"Unable to update config: {save_file.errorString()}")
+        return
+    save_file.write(config_data)
+    if not save_file.commit():
+        logger.warning(f"Unable to update config: {save_file.errorString()}")
+
 
-class ScanThread(QThread):
-    """Background thread for scanning files."""
+class ScanCancelled(Exception):
+    """Raised from the worker's progress callbacks to abort a cancelled scan."""
+
+
+class ScanWorker(QObject):
+    """
+    Scans files and finds duplicates; moved to a QThread by the main window.
+    
+    Progress is not signalled per update. The worker only records the
+    latest progress; the main window polls it with take_progress() on a
+    timer, so a burst of updates collapses into a single repaint.
     
-    progress = pyqtSignal(int, str)  # files_scanned, current_path
-    finished = pyqtSignal(list, list)  # files, duplicate_groups
+    stop() is safe to call directly from the UI thread. The scanner polls
+    is_cancelled() as directories complete; the engine checks through its
+    progress callback, which raises ScanCancelled once it is set.
+    """
+    
+    # files, duplicate_groups, total_duplicates, total_wasted (object: byte counts can exceed 32 bits)
+    finished = pyqtSignal(list, list, int, object)
     error = pyqtSignal(str)
+    cancelled = pyqtSignal()
     
-    def __init__(self, root_paths: List[str], use_perceptual: bool, parent=None):
-        super().__init__(parent)
+    def __init__(self, root_paths: List[str], use_perceptual: bool, config_data: bytes = None):
+        super().__init__()
         self.root_paths = root_paths
         self.use_perceptual = use_perceptual
+        self.config_data = config_data
+        self._progress_lock = QMutex()
+        self._latest_progress = None
+        self._cancelled = False
     
+    @pyqtSlot()
     def run(self):
         """Run the scanning and deduplication process."""
         try:
+            # Save options first, so the scanner and engine read the current ones
+            if self.config_data is not None:
+                save_config(self.config_data)
+            
             # Step 1: Scan files
             scanner = FileScanner()
             files = scanner.scan_directories(
                 self.root_paths,
-                progress_callback=lambda count, path: self.progress.emit(count, path)
+                progress_callback=self._report_progress,
+                cancel_check=self.is_cancelled
             )
             
+            if self._cancelled:
+                raise ScanCancelled()
+            
             if not files:
                 self.error.emit("No image files found in selected directories.")
                 return
@@ -54,14 +110,70 @@ class ScanThread(QThread):
             duplicate_groups = engine.find_duplicates(
                 files,
                 use_perceptual=self.use_perceptual,
-                progress_callback=lambda current, total: self.progress.emit(current, f"Analyzing {current}/{total}")
+                progress_callback=self._report_analysis,
+                size_buckets=scanner.size_buckets
             )
             
-            self.finished.emit(files, duplicate_groups)
+            if self._cancelled:
+                raise ScanCancelled()
+            
+            # Summary totals are computed here rather than on the UI thread
+            total_duplicates = 0
+            total_wasted = 0
+            for group in duplicate_groups:
+                total_duplicates += len(group.files)
+                total_wasted += group.get_total_wasted_space()
+            
+            self.finished.emit(files, duplicate_groups, total_duplicates, total_wasted)
+        
+        except ScanCancelled:
+            logger.info("Scan cancelled")
+            self.cancelled.emit()
         
         except Exception as e:
             logger.error(f"Error during scan: {e}", exc_info=True)
             self.error.emit(str(e))
+    
+    @pyqtSlot()
+    def stop(self):
+        """Ask the running scan to stop at its next progress update."""
+        self._cancelled = True
+    
+    def is_cancelled(self) -> bool:
+        """Whether stop() has been called (polled from the scan's thread)."""
+        return self._cancelled
+    
+    def _report_progress(self, count: int, current_path: str):
+        """Record the latest scan progress, replacing any update not yet shown."""
+        if self._cancelled:
+            raise ScanCancelled()
+        with QMutexLocker(self._progress_lock):
+            self._latest_progress = (count, current_path, None)
+    
+    def _report_analysis(self, current: int, total: int):
+        """
+        Record the latest deduplication progress.
+        
+        Only the numbers are stored; the status text is built on the UI
+        thread for the updates that are actually shown.
+        """
+        if self._cancelled:
+            raise ScanCancelled()
+        with QMutexLocker(self._progress_lock):
+            self._latest_progress = (current, None, total)
+    
+    def take_progress(self) -> Optional[Tuple[int, Optional[str], Optional[int]]]:
+        """
+        Get the latest progress since the previous call (called from the UI thread).
+        
+        Returns:
+            Tuple of (count, current_path, None) while scanning or
+            (current, None, total) while analyzing, or None if nothing new
+            was reported
+        """
+        with QMutexLocker(self._progress_lock):
+            progress, self._latest_progress = self._latest_progress, None
+        return progress
 
 
 class MainWindow(QMainWindow):
@@ -70,7 +182,15 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.selected_folders = []
+        self._selected_set = set()  # Same folders as selected_folders, for O(1) lookup
         self.scan_thread = None
+        self.scan_worker = None
+        self._config = {}
+        
+        # Polls the scan worker's progress; updates between ticks are coalesced
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(PROGRESS_POLL_MS)
+        self.progress_timer.timeout.connect(self.poll_scan_progress)
         self.init_ui()
         self.load_config()
     
@@ -90,10 +210,7 @@ class MainWindow(QMainWindow):
         
         # Title
         title_label = QLabel("Duplicate File Finder")
-        title_font = QFont()
-        title_font.setPointSize(18)
-        title_font.setBold(True)
-        title_label.setFont(title_font)
+        title_label.setFont(bold_font(18))
         layout.addWidget(title_label)
         
         # Folder selection group
@@ -112,43 +229,25 @@ class MainWindow(QMainWindow):
         # Scan button
         self.scan_button = QPushButton("Start Scan")
         self.scan_button.setMinimumHeight(40)
-        self.scan_button.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-            QPushButton:disabled {
-                background-color: #cccccc;
-            }
-        """)
+        self.scan_button.setObjectName("scanButton")
         self.scan_button.clicked.connect(self.start_scan)
         
         # Load previous results button
         self.load_results_button = QPushButton("📁 Load Previous Results")
         self.load_results_button.setMinimumHeight(40)
-        self.load_results_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #0b7dda;
-            }
-        """)
+        self.load_results_button.setObjectName("loadResultsButton")
         self.load_results_button.clicked.connect(self.load_previous_results)
         
+        # Cancel button (only visible while scanning)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setMinimumHeight(40)
+        self.cancel_button.setVisible(False)
+        self.cancel_button.clicked.connect(self.cancel_scan)
+        
         # Button layout
         button_layout = QHBoxLayout()
         button_layout.addWidget(self.scan_button)
+        button_layout.addWidget(self.cancel_button)
         button_layout.addWidget(self.load_results_button)
         layout.addLayout(button_layout)
         
@@ -161,7 +260,11 @@ class MainWindow(QMainWindow):
         layout = QVBoxLayout()
         
         # Folder list
-        self.folder_list = QListWidget()
+        self.folder_model = QStringListModel(self)
+        self.folder_list = QListView()
+        self.folder_list.setModel(self.folder_model)
+        self.folder_list.setUniformItemSizes(True)
+        self.folder_list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
         self.folder_list.setMinimumHeight(150)
         layout.addWidget(self.folder_list)
         
@@ -220,7 +323,7 @@ class MainWindow(QMainWindow):
         layout.addLayout(threshold_layout)
         
         help_label = QLabel("Note: Lower threshold = more strict matching")
-        help_label.setStyleSheet("color: #666; font-size: 10px;")
+        help_label.setObjectName("helpLabel")
         layout.addWidget(help_label)
         
         group.setLayout(layout)
@@ -250,26 +353,24 @@ class MainWindow(QMainWindow):
     
     def load_config(self):
         """Load configuration and set default values."""
-        try:
-            with open("config.json", 'r') as f:
-                config = json.load(f)
-            
-            # Set default options
-            scan_options = config.get('scan_options', {})
-            self.hidden_folders_checkbox.setChecked(
-                scan_options.get('include_hidden_folders', False)
-            )
-            
-            perceptual = config.get('perceptual_hash', {})
-            self.perceptual_checkbox.setChecked(
-                perceptual.get('enabled', False)
-            )
-            threshold = perceptual.get('similarity_threshold', 5)
-            self.threshold_slider.setValue(threshold)
-            self.threshold_label.setText(str(threshold))
+        # Kept in memory; later option changes are applied here, not re-read.
+        # Missing sections come from the shared defaults, so saving it back
+        # never drops options this window does not edit
+        config = self._config = load_config(CONFIG_PATH)
+        
+        # Set default options
+        scan_options = config['scan_options']
+        self.hidden_folders_checkbox.setChecked(
+            scan_options.get('include_hidden_folders', False)
+        )
         
-        except Exception as e:
-            logger.warning(f"Unable to load config: {e}")
+        perceptual = config['perceptual_hash']
+        self.perceptual_checkbox.setChecked(
+            perceptual.get('enabled', False)
+        )
+        threshold = perceptual.get('similarity_threshold', 5)
+        self.threshold_slider.setValue(threshold)
+        self.threshold_label.setText(str(threshold))
     
     def on_perceptual_toggled(self, checked: bool):
         """Handle perceptual checkbox toggle."""
@@ -285,24 +386,32 @@ class MainWindow(QMainWindow):
             self, 
             "Select Folder to Scan",
             "",
+            # Skip per-entry icon lookups and symlink resolution, which stall on network drives
             QFileDialog.Option.ShowDirsOnly
+            | QFileDialog.Option.DontUseCustomDirectoryIcons
+            | QFileDialog.Option.DontResolveSymlinks
+            | QFileDialog.Option.ReadOnly
         )
         
-        if folder and folder not in self.selected_folders:
+        if folder and folder not in self._selected_set:
+            self._selected_set.add(folder)
             self.selected_folders.append(folder)
-            self.folder_list.addItem(folder)
+            row = self.folder_model.rowCount()
+            self.folder_model.insertRow(row)
+            self.folder_model.setData(self.folder_model.index(row), folder)
     
     def remove_folder(self):
         """Remove selected folder from list."""
-        current_row = self.folder_list.currentRow()
+        current_row = self.folder_list.currentIndex().row()
         if current_row >= 0:
-            self.folder_list.takeItem(current_row)
-            del self.selected_folders[current_row]
+            self.folder_model.removeRow(current_row)
+            self._selected_set.discard(self.selected_folders.pop(current_row))
     
     def clear_folders(self):
         """Clear all folders from list."""
-        self.folder_list.clear()
+        self.folder_model.setStringList([])
         self.selected_folders.clear()
+        self._selected_set.clear()
     
     def start_scan(self):
         """Start the scanning process."""
@@ -314,51 +423,98 @@ class MainWindow(QMainWindow):
             )
             return
         
-        # Update config with current options
-        self.update_config()
+        # Update config with current options; the scan thread writes it to disk
+        config_data = self.update_config()
         
         # Show progress group
         self.progress_group.setVisible(True)
         self.scan_button.setEnabled(False)
-        self.progress_bar.setValue(0)
+        self.progress_bar.setRange(0, 0)  # Indeterminate: Qt animates it while scanning
         self.status_label.setText("Starting scan...")
-        
-        # Start scan thread
-        self.scan_thread = ScanThread(
-            self.selected_folders,
-            self.perceptual_checkbox.isChecked()
+        self.cancel_button.setEnabled(True)
+        self.cancel_button.setVisible(True)
+        
+        # Run the scan worker on its own thread
+        self.scan_thread = QThread(self)
+        self.scan_worker = ScanWorker(
+            list(self.selected_folders),
+            self.perceptual_checkbox.isChecked(),
+            config_data
         )
-        self.scan_thread.progress.connect(self.on_scan_progress)
-        self.scan_thread.finished.connect(self.on_scan_finished)
-        self.scan_thread.error.connect(self.on_scan_error)
+        self.scan_worker.moveToThread(self.scan_thread)
+        self.scan_thread.started.connect(self.scan_worker.run)
+        self.scan_worker.finished.connect(self.on_scan_finished)
+        self.scan_worker.error.connect(self.on_scan_error)
+        self.scan_worker.cancelled.connect(self.on_scan_cancelled)
+        for signal in (self.scan_worker.finished, self.scan_worker.error, self.scan_worker.cancelled):
+            signal.connect(self.scan_thread.quit)
+        self.scan_thread.finished.connect(self.scan_worker.deleteLater)
+        self.scan_thread.finished.connect(self.scan_thread.deleteLater)
         self.scan_thread.start()
+        self.progress_timer.start()
     
-    def update_config(self):
-        """Update config file with current options."""
-        try:
-            with open("config.json", 'r') as f:
-                config = json.load(f)
-            
-            config['scan_options']['include_hidden_folders'] = self.hidden_folders_checkbox.isChecked()
-            config['perceptual_hash']['enabled'] = self.perceptual_checkbox.isChecked()
-            config['perceptual_hash']['similarity_threshold'] = self.threshold_slider.value()
-            
-            with open("config.json", 'w') as f:
-                json.dump(config, f, indent=2)
+    def cancel_scan(self):
+        """Ask the running scan to stop."""
+        if self.scan_worker is None:
+            return
+        # Called directly: the worker's thread is busy in run() and would not
+        # process a queued call until the scan was over
+        self.scan_worker.stop()
+        self.cancel_button.setEnabled(False)
+        self.status_label.setText("Cancelling...")
+    
+    def update_config(self) -> bytes:
+        """
+        Apply the current options to the in-memory config.
+        
+        Returns:
+            Serialized config for the scan thread to save to disk
+        """
+        config = self._config
+        config.setdefault('scan_options', {})['include_hidden_folders'] = self.hidden_folders_checkbox.isChecked()
+        config.setdefault('perceptual_hash', {})['enabled'] = self.perceptual_checkbox.isChecked()
+        config['perceptual_hash']['similarity_threshold'] = self.threshold_slider.value()
+        
+        return json.dumps(config, indent=2).encode('utf-8')
+    
+    def poll_scan_progress(self):
+        """Show the scan worker's latest progress, if it has changed."""
+        if self.scan_worker is None:
+            return
+        progress = self.scan_worker.take_progress()
+        if progress is None:
+            return
         
-        except Exception as e:
-            logger.warning(f"Unable to update config: {e}")
+        count, current_path, total = progress
+        if total is None:
+            self.on_scan_progress(count, current_path)
+        else:
+            self.on_scan_progress(count, f"Analyzing {count}/{total}")
+    
+    def stop_progress_polling(self):
+        """Stop the progress timer after showing any final update, and release the worker."""
+        self.progress_timer.stop()
+        self.poll_scan_progress()
+        self.cancel_button.setVisible(False)
+        
+        # Both are deleted by deleteLater once the thread's event loop exits
+        self.scan_worker = None
+        self.scan_thread = None
     
     def on_scan_progress(self, count: int, message: str):
         """Handle scan progress updates."""
         self.files_label.setText(f"Files processed: {count}")
         self.status_label.setText(message)
-        # Pulse progress bar during scan
-        self.progress_bar.setValue((count % 100))
     
-    def on_scan_finished(self, files: List[FileInfo], duplicate_groups: List[DuplicateGroup]):
+    def on_scan_finished(self, 
+                         files: List[FileInfo], 
+                         duplicate_groups: List[DuplicateGroup], 
+                         total_duplicates: int, 
+                         total_wasted: int):
         """Handle scan completion."""
+        self.stop_progress_polling()
         self.scan_button.setEnabled(True)
+        self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(100)
         
         if not duplicate_groups:
@@ -370,11 +526,6 @@ class MainWindow(QMainWindow):
             self.progress_group.setVisible(False)
             return
         
-        # Calculate statistics
-        total_duplicates = sum(len(group.files) for group in duplicate_groups)
-        total_wasted = sum(group.get_total_wasted_space() for group in duplicate_groups)
-        from utils import format_bytes
-        
         self.status_label.setText(
             f"Found {len(duplicate_groups)} duplicate groups "
             f"({total_duplicates} files, {format_bytes(total_wasted)} wasted)"
@@ -383,9 +534,18 @@ class MainWindow(QMainWindow):
         # Open results view
         self.open_results_view(duplicate_groups)
     
+    def on_scan_cancelled(self):
+        """Handle a scan stopped by the user."""
+        self.stop_progress_polling()
+        self.scan_button.setEnabled(True)
+        self.progress_bar.setRange(0, 100)
+        self.progress_group.setVisible(False)
+    
     def on_scan_error(self, error_message: str):
         """Handle scan errors."""
+        self.stop_progress_polling()
         self.scan_button.setEnabled(True)
+        self.progress_bar.setRange(0, 100)
         self.progress_group.setVisible(False)
         
         QMessageBox.critical(
@@ -460,7 +620,6 @@ class MainWindow(QMainWindow):
             # Show success message
             total_files = sum(len(group.files) for group in duplicate_groups)
             total_wasted = sum(group.get_total_wasted_space() for group in duplicate_groups)
-            from utils import format_bytes
             
             QMessageBox.information(
                 self,
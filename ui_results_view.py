@@ -4,44 +4,207 @@ Displays duplicate groups and allows user to select files for deletion.
 """
 
 import os
-from typing import List, Dict
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import List, Dict, Optional, Tuple
+import numpy as np
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QLabel, QScrollArea, QGroupBox, QCheckBox, QTableWidget,
     QTableWidgetItem, QHeaderView, QMessageBox, QFileDialog, QComboBox
 )
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QPixmap, QFont, QIcon
+from PyQt6.QtCore import Qt, QSize, QTimer, pyqtSignal
+from PyQt6.QtGui import QPixmap, QPixmapCache, QIcon, QImage, QImageReader
 
 from deduplication_engine import DuplicateGroup
 from file_scanner import FileInfo
 from deletion_manager import DeletionManager, DeletionMethod
 from suggestion_engine import SuggestionEngine
-from ui_dialogs import DeletionConfirmationDialog
-from utils import format_bytes, generate_thumbnail
+from ui_dialogs import DeletionConfirmationDialog, DELETION_PREVIEW_LIMIT, bold_font
+from utils import (
+    ensure_thumbnail_dir, format_bytes, generate_thumbnail, get_thumbnail_cache_path, read_cached_thumbnail,
+    replace_thumbnail, THUMBNAIL_NORMAL_SIZE
+)
 from logger import get_logger
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = get_logger()
 
+# Thumbnails are decoded and resized off the UI thread; PIL releases the GIL
+# while it does so. Threads start on first use.
+_thumbnail_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+
+# Result exports run one at a time, off the UI thread
+_export_pool = ThreadPoolExecutor(max_workers=1)
+
+# In-memory thumbnail cache size, in KB; a 120 px thumbnail is about 56 KB
+PIXMAP_CACHE_LIMIT_KB = 100 * 1024
+
+# Minimum height of a duplicate group in the results list, in pixels
+GROUP_MIN_HEIGHT = 160
+
+# Edge length of the preview thumbnails, in pixels
+THUMBNAIL_SIZE = 120
+
+# Suggestion strategies offered in the results header, by display name
+STRATEGIES = {
+    "Keep Highest Resolution": "keep_highest_resolution",
+    "Keep Oldest": "keep_oldest",
+    "Keep Newest": "keep_newest",
+    "Keep Shortest Path": "keep_shortest_path"
+}
+
+
+def load_thumbnail(file_path: str, size: int = THUMBNAIL_SIZE) -> Optional[QImage]:
+    """
+    Load a preview thumbnail, from the shared thumbnail cache if possible.
+    
+    On a cache miss the original is decoded by QImageReader at thumbnail
+    size (for JPEG, scaled inside libjpeg), so the full-resolution image is
+    never held in memory, and the result is added to the cache. Formats Qt
+    has no plugin for fall back to PIL. Returns a QImage rather than a
+    QPixmap so it can run on a pool thread.
+    
+    Args:
+        file_path: Path to the original image
+        size: Maximum width and height of the thumbnail
+        
+    Returns:
+        Thumbnail image, or None if the file could not be decoded
+    """
+    data = read_cached_thumbnail(file_path)
+    image = QImage.fromData(data) if data else QImage()
+    
+    if image.isNull():
+        image = _read_scaled(file_path, THUMBNAIL_NORMAL_SIZE)
+        if image.isNull():
+            thumbnail_path = generate_thumbnail(file_path)
+            if not thumbnail_path:
+                return None
+            image = QImage(thumbnail_path)
+            if image.isNull():
+                return None
+        else:
+            _store_thumbnail(file_path, image)
+    
+    return image.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+
+def _read_scaled(image_path: str, size: int) -> QImage:
+    """Decode an image scaled to fit within size x size (a null QImage on failure)."""
+    reader = QImageReader(image_path)
+    reader.setAutoTransform(True)
+    source_size = reader.size()
+    if source_size.isValid():
+        reader.setScaledSize(source_size.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio))
+    return reader.read()
+
+
+def _store_thumbnail(file_path: str, image: QImage):
+    """Write a thumbnail to the thumbnail cache with the tags the freedesktop.org spec requires."""
+    uri, thumbnail_path = get_thumbnail_cache_path(file_path)
+    try:
+        mtime = int(os.stat(file_path).st_mtime)
+        ensure_thumbnail_dir(os.path.dirname(thumbnail_path))
+    except OSError as e:
+        logger.warning(f"Unable to cache thumbnail for {file_path}: {e}")
+        return
+    
+    image.setText('Thumb::URI', uri)
+    image.setText('Thumb::MTime', str(mtime))
+    
+    def save(temp_path: str):
+        if not image.save(temp_path, 'PNG'):
+            raise OSError("PNG encoding failed")
+    
+    try:
+        replace_thumbnail(thumbnail_path, save)
+    except OSError as e:
+        logger.warning(f"Unable to cache thumbnail for {file_path}: {e}")
+
+
+def _pixmap_cache_key(file_info: FileInfo) -> str:
+    """QPixmapCache key for a file's thumbnail; changes when the file does."""
+    return f"{file_info.size}:{file_info.modified_time}:{file_info.path}"
+
+
+def write_results_json(duplicate_groups: List[DuplicateGroup], file_path: str):
+    """
+    Write duplicate groups to a JSON file.
+    
+    Groups are encoded and written one at a time, so only one group's
+    dictionary exists at once. Uses orjson when it is installed; it encodes
+    straight to UTF-8 bytes and is several times faster than the json module.
+    
+    Resolutions must already be resolved (see ResultsView.export_results),
+    since FileInfo.to_dict would otherwise fill them in on this thread.
+    
+    Args:
+        duplicate_groups: Groups to export
+        file_path: Destination JSON file
+    """
+    if ORJSON_AVAILABLE:
+        dumps = orjson.dumps
+    else:
+        def dumps(value) -> bytes:
+            return json.dumps(value, ensure_ascii=False).encode('utf-8')
+    
+    with open(file_path, 'wb') as f:
+        f.write(b'{\n  "total_groups": %d,\n  "groups": [' % len(duplicate_groups))
+        for i, group in enumerate(duplicate_groups):
+            f.write(b',\n    ' if i else b'\n    ')
+            f.write(dumps(group.to_dict()))
+        f.write(b'\n  ]\n}\n' if duplicate_groups else b']\n}\n')
+
 
 class DuplicateGroupWidget(QGroupBox):
-    """Widget to display a single duplicate group."""
+    """
+    Widget to display a single duplicate group.
+    
+    The table, thumbnails and buttons are only built while the group is near
+    the visible part of the results (see materialize). The selection lives
+    in the widget itself, so it survives the contents being released.
+    """
     
-    def __init__(self, group: DuplicateGroup, group_number: int, strategy: str, parent=None):
+    # row, thumbnail QImage (or None); emitted from a thumbnail pool thread
+    thumbnail_ready = pyqtSignal(int, object)
+    # change in selected file count and selected bytes (object: may exceed 32 bits)
+    selection_changed = pyqtSignal(int, object)
+    
+    def __init__(self, group: DuplicateGroup, group_number: int, keeper_path: str, reason: str, parent=None):
         super().__init__(parent)
         self.group = group
         self.group_number = group_number
-        self.strategy = strategy
+        self.keeper_path = keeper_path
+        self.reason = reason
+        # Row-aligned file columns and the per-row "checked for deletion" mask
+        self._paths = np.array([f.path for f in group.files])
+        self._sizes = np.fromiter((f.size for f in group.files), np.int64, len(group.files))
+        self._checked = np.zeros(len(group.files), dtype=bool)
+        self.selected_count = 0  # Running totals of the checked files
+        self.selected_bytes = 0
+        
+        # Contents, present only while materialized
+        self._content: Optional[QWidget] = None
         self.checkboxes: Dict[str, QCheckBox] = {}
+        self.thumbnail_labels: List[QLabel] = []
+        self._thumbnail_futures: List[Future] = []
+        # Per-row items restyled by update_keeper: (path, size, keep) columns
+        self._row_items: List[Tuple[QTableWidgetItem, QTableWidgetItem, QTableWidgetItem]] = []
+        
+        self.thumbnail_ready.connect(self.show_thumbnail)
         self.init_ui()
+        self.select_except_suggested(keeper_path)
     
     def init_ui(self):
-        """Initialize the UI for this group."""
-        # Get suggestion
-        suggestion_engine = SuggestionEngine()
-        keeper, reason = suggestion_engine.suggest_keeper(self.group.files, self.strategy)
-        
+        """Initialize the always-present frame of this group."""
         # Group title - clearer formatting
         wasted = format_bytes(self.group.get_total_wasted_space())
         group_title = (
@@ -50,26 +213,29 @@ class DuplicateGroupWidget(QGroupBox):
         )
         self.setTitle(group_title)
         
-        # Style the group box
-        self.setStyleSheet("""
-            QGroupBox {
-                font-size: 13px;
-                font-weight: bold;
-                border: 2px solid #555;
-                border-radius: 8px;
-                margin-top: 12px;
-                padding-top: 15px;
-                background-color: #2b2b2b;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-                color: #4CAF50;
-            }
-        """)
+        # Style the group box (rules are in styles.APP_STYLESHEET)
+        self.setObjectName("duplicateGroup")
         
         layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+        
+        # Built or not, a group takes the same height, so building and
+        # releasing contents never moves the groups around it
+        self.setMinimumHeight(GROUP_MIN_HEIGHT)
+    
+    @property
+    def is_materialized(self) -> bool:
+        """Whether the table and buttons are currently built."""
+        return self._content is not None
+    
+    def materialize(self):
+        """Build the table, thumbnails and buttons for this group."""
+        if self._content is not None:
+            return
+        
+        self._content = QWidget()
+        layout = QVBoxLayout(self._content)
         layout.setSpacing(10)
         
         # CLEANER TABLE: Only essential columns
@@ -88,34 +254,30 @@ class DuplicateGroupWidget(QGroupBox):
         table.setShowGrid(True)
         
         # Style the table
-        table.setStyleSheet("""
-            QTableWidget {
-                background-color: #1e1e1e;
-                alternate-background-color: #252525;
-                gridline-color: #404040;
-                font-size: 11px;
-            }
-            QTableWidget::item {
-                padding: 5px;
-            }
-            QHeaderView::section {
-                background-color: #333;
-                color: white;
-                font-weight: bold;
-                padding: 8px;
-                border: 1px solid #555;
-            }
-        """)
+        table.setObjectName("groupTable")
+        
+        # Resize columns for better visibility; set before filling so the
+        # ResizeToContents columns are measured once, not after every insert
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)  # Checkbox
+        table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)  # Thumbnail
+        table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)  # Path (takes most space)
+        table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)  # Size
+        table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)  # Keep?
+        
+        # Taller rows for better thumbnail visibility
+        table.verticalHeader().setDefaultSectionSize(130)
+        
+        # Fill the table in one batch: no repaints or item signals per cell
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
         
         # Populate table with clearer layout
         for i, file_info in enumerate(self.group.files):
-            is_suggested = (file_info.path == keeper.path)
-            
             # Checkbox - for deletion selection
             checkbox = QCheckBox()
-            if not is_suggested:
-                checkbox.setChecked(True)  # Pre-select for deletion (NOT the keeper)
+            checkbox.setChecked(bool(self._checked[i]))
             checkbox.setToolTip("Check to delete this file")
+            checkbox.toggled.connect(functools.partial(self._on_toggled, i))
             self.checkboxes[file_info.path] = checkbox
             checkbox_widget = QWidget()
             checkbox_layout = QHBoxLayout(checkbox_widget)
@@ -124,64 +286,41 @@ class DuplicateGroupWidget(QGroupBox):
             checkbox_layout.setContentsMargins(0, 0, 0, 0)
             table.setCellWidget(i, 0, checkbox_widget)
             
-            # Larger thumbnail for better visibility
-            thumbnail_label = QLabel()
-            thumbnail_path = generate_thumbnail(file_info.path)
-            if thumbnail_path and os.path.exists(thumbnail_path):
-                pixmap = QPixmap(thumbnail_path)
-                scaled_pixmap = pixmap.scaled(
-                    120, 120,  # Larger thumbnail
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                thumbnail_label.setPixmap(scaled_pixmap)
-            else:
-                thumbnail_label.setText("No\nPreview")
-                thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            # Larger thumbnail for better visibility; filled in by show_thumbnail
+            # unless it is still in the pixmap cache
+            thumbnail_label = QLabel("Loading...")
+            thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.thumbnail_labels.append(thumbnail_label)
             table.setCellWidget(i, 1, thumbnail_label)
             
+            pixmap = QPixmapCache.find(_pixmap_cache_key(file_info))
+            if pixmap is not None:
+                thumbnail_label.setPixmap(pixmap)
+            else:
+                future = _thumbnail_pool.submit(load_thumbnail, file_info.path)
+                future.add_done_callback(functools.partial(self._on_thumbnail_done, i))
+                self._thumbnail_futures.append(future)
+            
             # FULL PATH - This is what user wants to see!
             path_item = QTableWidgetItem(file_info.path)
             path_item.setToolTip(f"Click to copy path\n{file_info.path}")
-            
-            # Color code the suggested keeper
-            if is_suggested:
-                path_item.setBackground(Qt.GlobalColor.darkGreen)
-                path_item.setForeground(Qt.GlobalColor.white)
-            
             table.setItem(i, 2, path_item)
             
             # Size
             size_item = QTableWidgetItem(format_bytes(file_info.size))
-            if is_suggested:
-                size_item.setBackground(Qt.GlobalColor.darkGreen)
-                size_item.setForeground(Qt.GlobalColor.white)
             table.setItem(i, 3, size_item)
             
             # Clear "Keep" indicator with reasoning
-            if is_suggested:
-                keep_text = f"⭐ KEEP\n{reason}"
-                keep_item = QTableWidgetItem(keep_text)
-                keep_item.setFont(QFont("", -1, QFont.Weight.Bold))
-                keep_item.setBackground(Qt.GlobalColor.darkGreen)
-                keep_item.setForeground(Qt.GlobalColor.white)
-                keep_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            else:
-                keep_item = QTableWidgetItem("Delete")
-                keep_item.setForeground(Qt.GlobalColor.lightGray)
-                keep_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            keep_item = QTableWidgetItem()
+            keep_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
             table.setItem(i, 4, keep_item)
+            
+            self._row_items.append((path_item, size_item, keep_item))
         
-        # Resize columns for better visibility
-        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)  # Checkbox
-        table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)  # Thumbnail
-        table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)  # Path (takes most space)
-        table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)  # Size
-        table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)  # Keep?
+        self._apply_keeper_style()
         
-        # Taller rows for better thumbnail visibility
-        for i in range(len(self.group.files)):
-            table.setRowHeight(i, 130)
+        table.blockSignals(False)
+        table.setUpdatesEnabled(True)
         
         layout.addWidget(table)
         
@@ -190,7 +329,7 @@ class DuplicateGroupWidget(QGroupBox):
         
         # Info label
         info_label = QLabel(f"💡 Green row = Suggested file to KEEP")
-        info_label.setStyleSheet("color: #4CAF50; font-weight: bold; font-size: 11px;")
+        info_label.setObjectName("keepHintLabel")
         button_layout.addWidget(info_label)
         
         button_layout.addStretch()
@@ -198,19 +337,8 @@ class DuplicateGroupWidget(QGroupBox):
         # Quick actions
         keep_suggested_btn = QPushButton("✓ Keep Only Suggested")
         keep_suggested_btn.setToolTip("Select all files EXCEPT the suggested keeper for deletion")
-        keep_suggested_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                padding: 8px 15px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
-        keep_suggested_btn.clicked.connect(lambda: self.select_except_suggested(keeper.path))
+        keep_suggested_btn.setObjectName("keepSuggestedButton")
+        keep_suggested_btn.clicked.connect(lambda: self.select_except_suggested(self.keeper_path))
         button_layout.addWidget(keep_suggested_btn)
         
         clear_btn = QPushButton("Clear Selection")
@@ -219,40 +347,165 @@ class DuplicateGroupWidget(QGroupBox):
         
         layout.addLayout(button_layout)
         
-        self.setLayout(layout)
+        self.layout().addWidget(self._content)
+    
+    def dematerialize(self):
+        """Release the table, thumbnails and buttons, keeping the selection."""
+        if self._content is None:
+            return
+        
+        self.cancel_thumbnails()
+        self.layout().removeWidget(self._content)
+        self._content.deleteLater()
+        self._content = None
+        self.checkboxes.clear()
+        self.thumbnail_labels.clear()
+        self._thumbnail_futures.clear()
+        self._row_items.clear()
+    
+    def _on_toggled(self, row: int, checked: bool):
+        """Record a checkbox click in the selection mask and update the totals."""
+        if checked == self._checked[row]:
+            return
+        
+        self._checked[row] = checked
+        sign = 1 if checked else -1
+        size = int(self._sizes[row])
+        self.selected_count += sign
+        self.selected_bytes += sign * size
+        self.selection_changed.emit(sign, sign * size)
+    
+    def _set_selection(self, mask: np.ndarray):
+        """
+        Replace the whole selection at once.
+        
+        Totals are recomputed from the mask, and only checkboxes whose state
+        changes are touched, with their signals blocked, so the view gets a
+        single selection_changed for the group.
+        
+        Args:
+            mask: Boolean array, True for rows to select for deletion
+        """
+        changed = np.flatnonzero(mask != self._checked)
+        if not len(changed):
+            return
+        
+        self._checked = mask
+        count = int(np.count_nonzero(mask))
+        size = int(self._sizes[mask].sum())
+        
+        if self.checkboxes:
+            for row in changed.tolist():
+                checkbox = self.checkboxes[self._paths[row]]
+                checkbox.blockSignals(True)
+                checkbox.setChecked(bool(mask[row]))
+                checkbox.blockSignals(False)
+        
+        count_delta, bytes_delta = count - self.selected_count, size - self.selected_bytes
+        self.selected_count, self.selected_bytes = count, size
+        self.selection_changed.emit(count_delta, bytes_delta)
+    
+    def _on_thumbnail_done(self, row: int, future: Future):
+        """Forward a finished thumbnail to the UI thread (runs in a pool thread)."""
+        if future.cancelled():
+            return
+        try:
+            self.thumbnail_ready.emit(row, future.result())
+        except RuntimeError:
+            pass  # The widget was deleted while the thumbnail was generated
+    
+    def show_thumbnail(self, row: int, image: Optional[QImage]):
+        """Show a loaded thumbnail in its table row."""
+        if row >= len(self.thumbnail_labels):
+            return  # Contents were released before the thumbnail arrived
+        thumbnail_label = self.thumbnail_labels[row]
+        if image is not None:
+            # Already at display size, so no second scaling pass
+            pixmap = QPixmap.fromImage(image)
+            QPixmapCache.insert(_pixmap_cache_key(self.group.files[row]), pixmap)
+            thumbnail_label.setPixmap(pixmap)
+        else:
+            thumbnail_label.setText("No\nPreview")
+    
+    def cancel_thumbnails(self):
+        """Drop thumbnails that have not started generating yet."""
+        for future in self._thumbnail_futures:
+            future.cancel()
+    
+    def update_keeper(self, keeper_path: str, reason: str):
+        """
+        Mark a file as the suggested keeper and pre-select the others for deletion.
+        
+        Only item styling and checkbox states change; the table and its
+        thumbnails are kept.
+        
+        Args:
+            keeper_path: Path of the file to keep
+            reason: Why the file was suggested
+        """
+        self.keeper_path = keeper_path
+        self.reason = reason
+        self._apply_keeper_style()
+        
+        # Pre-select for deletion (NOT the keeper)
+        self.select_except_suggested(keeper_path)
+    
+    def _apply_keeper_style(self):
+        """Color the keeper's row and label each row Keep or Delete."""
+        for file_info, (path_item, size_item, keep_item) in zip(self.group.files, self._row_items):
+            is_suggested = (file_info.path == self.keeper_path)
+            
+            # Color code the suggested keeper; None restores the table's own colors
+            background = Qt.GlobalColor.darkGreen if is_suggested else None
+            foreground = Qt.GlobalColor.white if is_suggested else None
+            for item in (path_item, size_item, keep_item):
+                item.setData(Qt.ItemDataRole.BackgroundRole, background)
+                item.setData(Qt.ItemDataRole.ForegroundRole, foreground)
+            
+            if is_suggested:
+                keep_item.setText(f"⭐ KEEP\n{self.reason}")
+                keep_item.setFont(bold_font())
+            else:
+                keep_item.setText("Delete")
+                keep_item.setData(Qt.ItemDataRole.FontRole, None)
+                keep_item.setForeground(Qt.GlobalColor.lightGray)
     
     def select_except_suggested(self, keeper_path: str):
         """Select all files except the suggested keeper."""
-        for path, checkbox in self.checkboxes.items():
-            checkbox.setChecked(path != keeper_path)
+        self._set_selection(self._paths != keeper_path)
     
     def select_all(self):
         """Select all files in this group."""
-        for checkbox in self.checkboxes.values():
-            checkbox.setChecked(True)
+        self._set_selection(np.ones(len(self._paths), dtype=bool))
     
     def deselect_all(self):
         """Deselect all files in this group."""
-        for checkbox in self.checkboxes.values():
-            checkbox.setChecked(False)
+        self._set_selection(np.zeros(len(self._paths), dtype=bool))
     
     def get_selected_files(self) -> List[FileInfo]:
         """Get list of selected files."""
-        selected = []
-        for file_info in self.group.files:
-            if self.checkboxes[file_info.path].isChecked():
-                selected.append(file_info)
-        return selected
+        return [self.group.files[i] for i in np.flatnonzero(self._checked).tolist()]
 
 
 class ResultsView(QMainWindow):
     """Results view window displaying duplicate groups."""
     
+    # file path, exception (or None); emitted from the export thread
+    export_finished = pyqtSignal(str, object)
+    
     def __init__(self, duplicate_groups: List[DuplicateGroup], parent=None):
         super().__init__(parent)
         self.duplicate_groups = duplicate_groups
         self.group_widgets: List[DuplicateGroupWidget] = []
         self.strategy = 'keep_highest_resolution'
+        self.suggestion_engine = SuggestionEngine()
+        self._keeper_cache: Dict[Tuple[int, str], Tuple[str, str]] = {}  # (group index, strategy) -> (keeper path, reason)
+        self._selected_count = 0  # Totals over all group widgets, kept up to date by selection_changed
+        self._selected_bytes = 0
+        self._visible_update_pending = False
+        QPixmapCache.setCacheLimit(PIXMAP_CACHE_LIMIT_KB)
+        self._deletion_dialog: Optional[DeletionConfirmationDialog] = None  # Built on first use, then reused
+        self.export_finished.connect(self.on_export_finished)
         self.init_ui()
     
     def init_ui(self):
@@ -272,10 +525,7 @@ class ResultsView(QMainWindow):
         header_layout = QHBoxLayout()
         
         title_label = QLabel(f"Found {len(self.duplicate_groups)} Duplicate Groups")
-        title_font = QFont()
-        title_font.setPointSize(16)
-        title_font.setBold(True)
-        title_label.setFont(title_font)
+        title_label.setFont(bold_font(16))
         header_layout.addWidget(title_label)
         
         header_layout.addStretch()
@@ -283,21 +533,17 @@ class ResultsView(QMainWindow):
         # Strategy selector
         header_layout.addWidget(QLabel("Suggestion strategy:"))
         self.strategy_combo = QComboBox()
-        self.strategy_combo.addItems([
-            "Keep Highest Resolution",
-            "Keep Oldest",
-            "Keep Newest",
-            "Keep Shortest Path"
-        ])
+        self.strategy_combo.addItems(list(STRATEGIES))
         self.strategy_combo.currentTextChanged.connect(self.on_strategy_changed)
         header_layout.addWidget(self.strategy_combo)
         
         layout.addLayout(header_layout)
         
         # Scroll area for groups
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.schedule_visible_update)
         
         scroll_widget = QWidget()
         scroll_layout = QVBoxLayout(scroll_widget)
@@ -306,8 +552,8 @@ class ResultsView(QMainWindow):
         self.create_group_widgets(scroll_layout)
         
         scroll_layout.addStretch()
-        scroll_area.setWidget(scroll_widget)
-        layout.addWidget(scroll_area)
+        self.scroll_area.setWidget(scroll_widget)
+        layout.addWidget(self.scroll_area)
         
         # Bottom panel
         bottom_layout = QHBoxLayout()
@@ -320,26 +566,14 @@ class ResultsView(QMainWindow):
         bottom_layout.addStretch()
         
         # Export button
-        export_btn = QPushButton("Export Results")
-        export_btn.clicked.connect(self.export_results)
-        bottom_layout.addWidget(export_btn)
+        self.export_btn = QPushButton("Export Results")
+        self.export_btn.clicked.connect(self.export_results)
+        bottom_layout.addWidget(self.export_btn)
         
         # Delete button
         delete_btn = QPushButton("Delete Selected Files")
         delete_btn.setMinimumHeight(40)
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-                border-radius: 5px;
-                padding: 0 20px;
-            }
-            QPushButton:hover {
-                background-color: #da190b;
-            }
-        """)
+        delete_btn.setObjectName("deleteSelectedButton")
         delete_btn.clicked.connect(self.delete_selected)
         bottom_layout.addWidget(delete_btn)
         
@@ -348,63 +582,136 @@ class ResultsView(QMainWindow):
     def create_group_widgets(self, layout: QVBoxLayout):
         """Create widgets for all duplicate groups."""
         self.group_widgets.clear()
+        self._selected_count = 0
+        self._selected_bytes = 0
+        self.resolve_suggestions()
         
-        for i, group in enumerate(self.duplicate_groups, 1):
-            group_widget = DuplicateGroupWidget(group, i, self.strategy)
+        for i, group in enumerate(self.duplicate_groups):
+            keeper_path, reason = self.get_suggestion(i)
+            group_widget = DuplicateGroupWidget(group, i + 1, keeper_path, reason)
+            
+            # Start from the widget's initial selection, then follow its changes
+            self._selected_count += group_widget.selected_count
+            self._selected_bytes += group_widget.selected_bytes
+            group_widget.selection_changed.connect(self.on_selection_changed)
+            
             self.group_widgets.append(group_widget)
             layout.addWidget(group_widget)
     
-    def on_strategy_changed(self, text: str):
-        """Handle strategy change."""
-        strategy_map = {
-            "Keep Highest Resolution": "keep_highest_resolution",
-            "Keep Oldest": "keep_oldest",
-            "Keep Newest": "keep_newest",
-            "Keep Shortest Path": "keep_shortest_path"
-        }
-        
-        self.strategy = strategy_map.get(text, "keep_highest_resolution")
-        
-        # Recreate group widgets with new strategy
-        # Remove old widgets
-        scroll_area = self.centralWidget().layout().itemAt(1).widget()
-        scroll_widget = scroll_area.widget()
-        layout = scroll_widget.layout()
-        
-        # Clear layout
-        for i in reversed(range(layout.count())):
-            item = layout.itemAt(i)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # Recreate widgets
-        self.create_group_widgets(layout)
-        layout.addStretch()
+    def schedule_visible_update(self):
+        """Update which groups are built once pending layout changes have settled."""
+        if not self._visible_update_pending:
+            self._visible_update_pending = True
+            QTimer.singleShot(0, self.update_visible_groups)
     
-    def update_summary(self):
-        """Update the summary label."""
-        selected_files = []
-        total_size = 0
+    def update_visible_groups(self):
+        """
+        Build the groups near the viewport and release the rest.
+        
+        Groups within one viewport height above or below the visible area are
+        built too, so scrolling a little never shows empty placeholders.
+        """
+        self._visible_update_pending = False
+        
+        viewport_height = self.scroll_area.viewport().height()
+        top = self.scroll_area.verticalScrollBar().value() - viewport_height
+        bottom = top + 3 * viewport_height
         
+        materialized = False
         for group_widget in self.group_widgets:
-            selected = group_widget.get_selected_files()
-            selected_files.extend(selected)
-            total_size += sum(f.size for f in selected)
+            geometry = group_widget.geometry()
+            if geometry.bottom() >= top and geometry.top() <= bottom:
+                if not group_widget.is_materialized:
+                    group_widget.materialize()
+                    materialized = True
+            else:
+                group_widget.dematerialize()
+        
+        # Built groups can change height and move the others into range
+        if materialized:
+            self.schedule_visible_update()
+    
+    def showEvent(self, event):
+        """Build the initially visible groups once the window is laid out."""
+        super().showEvent(event)
+        self.schedule_visible_update()
+    
+    def resizeEvent(self, event):
+        """Re-check visible groups when the viewport size changes."""
+        super().resizeEvent(event)
+        self.schedule_visible_update()
+    
+    def resolve_suggestions(self):
+        """
+        Compute the keepers of all groups for the current strategy at once.
+        
+        Suggestions read image headers or file metadata, so groups are
+        resolved on a thread pool where that I/O overlaps.
+        """
+        missing = [i for i in range(len(self.duplicate_groups)) if (i, self.strategy) not in self._keeper_cache]
+        if not missing:
+            return
+        
+        strategy = self.strategy
+        groups = self.duplicate_groups
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as executor:
+            suggestions = executor.map(
+                lambda i: self.suggestion_engine.suggest_keeper(groups[i].files, strategy, groups[i].table),
+                missing
+            )
+            for i, (keeper, reason) in zip(missing, suggestions):
+                self._keeper_cache[(i, strategy)] = (keeper.path, reason)
+    
+    def get_suggestion(self, group_index: int) -> Tuple[str, str]:
+        """
+        Get the suggested keeper of a group under the current strategy.
+        
+        Returns:
+            Tuple of (keeper path, reason), computed once per group and strategy
+        """
+        key = (group_index, self.strategy)
+        suggestion = self._keeper_cache.get(key)
+        if suggestion is None:
+            group = self.duplicate_groups[group_index]
+            keeper, reason = self.suggestion_engine.suggest_keeper(group.files, self.strategy, group.table)
+            suggestion = self._keeper_cache[key] = (keeper.path, reason)
+        return suggestion
+    
+    def on_strategy_changed(self, text: str):
+        """Handle strategy change."""
+        self.strategy = STRATEGIES.get(text, "keep_highest_resolution")
         
+        # Restyle the existing group widgets for the new keepers
+        self.resolve_suggestions()
+        for i, group_widget in enumerate(self.group_widgets):
+            group_widget.update_keeper(*self.get_suggestion(i))
+    
+    def closeEvent(self, event):
+        """Drop thumbnails still queued for this window."""
+        for group_widget in self.group_widgets:
+            group_widget.cancel_thumbnails()
+        super().closeEvent(event)
+    
+    def on_selection_changed(self, count_delta: int, bytes_delta: int):
+        """Apply one group's selection change to the totals."""
+        self._selected_count += count_delta
+        self._selected_bytes += bytes_delta
+        self.update_summary()
+    
+    def update_summary(self):
+        """Update the summary label from the running selection totals."""
         self.summary_label.setText(
-            f"<b>{len(selected_files)} files selected</b> - "
-            f"<b>{format_bytes(total_size)}</b> to free"
+            f"<b>{self._selected_count} files selected</b> - "
+            f"<b>{format_bytes(self._selected_bytes)}</b> to free"
         )
     
     def delete_selected(self):
         """Delete selected files."""
-        # Update summary
-        self.update_summary()
-        
         # Get all selected files
         selected_files = []
         for group_widget in self.group_widgets:
             selected_files.extend(group_widget.get_selected_files())
+        total_size = self._selected_bytes
         
         if not selected_files:
             QMessageBox.warning(
@@ -415,7 +722,13 @@ class ResultsView(QMainWindow):
             return
         
         # Show confirmation dialog
-        dialog = DeletionConfirmationDialog(selected_files, self)
+        # The dialog only gets a preview; the full list stays here for the deletion itself
+        preview_paths = [f.path for f in islice(selected_files, DELETION_PREVIEW_LIMIT)]
+        dialog = self._deletion_dialog
+        if dialog is None:
+            dialog = self._deletion_dialog = DeletionConfirmationDialog(len(selected_files), total_size, preview_paths, self)
+        else:
+            dialog.reset(len(selected_files), total_size, preview_paths)
         if dialog.exec() == dialog.DialogCode.Accepted:
             method, confirmed = dialog.get_result()
             
@@ -467,25 +780,39 @@ class ResultsView(QMainWindow):
         if not file_path:
             return
         
+        # The export includes resolutions; read any missing ones here so the
+        # export thread never modifies FileInfo objects the UI shares
+        for group in self.duplicate_groups:
+            for file_info in group.files:
+                file_info.get_resolution()
+        
+        # Serializing every group can take seconds for large scans, so it runs
+        # on the export thread; on_export_finished reports the outcome
+        self.export_btn.setEnabled(False)
+        future = _export_pool.submit(write_results_json, self.duplicate_groups, file_path)
+        future.add_done_callback(lambda done: self._on_export_done(file_path, done))
+    
+    def _on_export_done(self, file_path: str, future: Future):
+        """Forward the export outcome to the UI thread (runs on the export thread)."""
         try:
-            data = {
-                'total_groups': len(self.duplicate_groups),
-                'groups': [group.to_dict() for group in self.duplicate_groups]
-            }
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
+            self.export_finished.emit(file_path, future.exception())
+        except RuntimeError:
+            pass  # The window was closed during the export
+    
+    def on_export_finished(self, file_path: str, error: Optional[Exception]):
+        """Report a finished export."""
+        self.export_btn.setEnabled(True)
+        
+        if error is None:
             QMessageBox.information(
                 self,
                 "Export Successful",
                 f"Results exported to:\n{file_path}"
             )
-        
-        except Exception as e:
-            logger.error(f"Export failed: {e}")
+        else:
+            logger.error(f"Export failed: {error}")
             QMessageBox.critical(
                 self,
                 "Export Failed",
-                f"Failed to export results:\n{str(e)}"
+                f"Failed to export results:\n{str(error)}"
             )
@@ -4,37 +4,119 @@ Provides helpers for file operations, formatting, and image processing.
 """
 
 import os
+import mmap
+import functools
 import hashlib
-from typing import Tuple, Optional
-from PIL import Image
+import io
+import pathlib
+import tempfile
+from typing import Callable, Tuple, Optional
+from PIL import Image, PngImagePlugin
 from logger import get_logger
 
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+try:
+    import pyvips
+    PYVIPS_AVAILABLE = True
+except (ImportError, OSError):  # OSError when the libvips shared library is missing
+    PYVIPS_AVAILABLE = False
+
 logger = get_logger()
 
+# Content hash used when none is configured; BLAKE3 is far faster than SHA-256
+DEFAULT_HASH_ALGORITHM = 'blake3' if BLAKE3_AVAILABLE else 'sha256'
+
+# Bound once at import; looking the function up through ctypes.windll on
+# every call re-resolves it and leaves argument conversion unchecked
+if os.name == 'nt':
+    import ctypes
+    from ctypes import wintypes
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _GetFileAttributesW = _kernel32.GetFileAttributesW
+    _GetFileAttributesW.argtypes = [wintypes.LPCWSTR]
+    _GetFileAttributesW.restype = wintypes.DWORD
+    _CreateFileW = _kernel32.CreateFileW
+    _CreateFileW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+                             wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE]
+    _CreateFileW.restype = wintypes.HANDLE
+    _CloseHandle = _kernel32.CloseHandle
+    _CloseHandle.argtypes = [wintypes.HANDLE]
+    INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+    fcntl = None
+else:
+    import fcntl
+    _GetFileAttributesW = None
+
+INVALID_FILE_ATTRIBUTES = 0xFFFFFFFF
+
+# CreateFileW arguments for the lock probe in is_file_locked
+_DELETE_ACCESS = 0x00010000
+_FILE_SHARE_ALL = 0x1 | 0x2 | 0x4  # FILE_SHARE_READ | FILE_SHARE_WRITE | FILE_SHARE_DELETE
+_OPEN_EXISTING = 3
+
+# Common system folders on Windows
+SYSTEM_FOLDERS = frozenset({
+    '$recycle.bin', 'system volume information', 'windows',
+    'program files', 'program files (x86)', 'programdata',
+    'appdata', '$windows.~bt', 'recovery', 'perflogs'
+})
+
+# Maximum number of memoized image resolutions
+RESOLUTION_CACHE_SIZE = 100_000
+
+# Files larger than this are hashed through a memory map instead of chunked reads
+MMAP_HASH_THRESHOLD = 1024 * 1024
 
+# Window size for prefetching ahead of the hasher in memory-mapped files
+MMAP_HASH_WINDOW = 8 * 1024 * 1024
+
+
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
+@functools.lru_cache(maxsize=4096)
 def format_bytes(bytes_size: int) -> str:
     """
     Convert bytes to human-readable format (KB, MB, GB, TB).
     
+    The unit is picked from the bit length (every 10 bits is one step of
+    1024), so only one division is needed. Sizes under 1 KB are whole bytes
+    and are shown without a fraction. Results are cached since duplicate
+    files share their sizes.
+    
     Args:
         bytes_size: Size in bytes
         
     Returns:
         Formatted string (e.g., "1.5 MB")
     """
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if bytes_size < 1024.0:
-            return f"{bytes_size:.2f} {unit}"
-        bytes_size /= 1024.0
-    return f"{bytes_size:.2f} PB"
+    bytes_size = int(bytes_size)
+    if bytes_size < 1024:
+        return f"{bytes_size} B"
+    
+    unit = min(bytes_size.bit_length() - 1, 50) // 10
+    return f"{bytes_size / (1 << (unit * 10)):.2f} {_BYTE_UNITS[unit]}"
 
 
-def get_image_resolution(file_path: str) -> Optional[Tuple[int, int]]:
+@functools.lru_cache(maxsize=RESOLUTION_CACHE_SIZE)
+def get_image_resolution(file_path: str, 
+                         modified_time: Optional[float] = None, 
+                         size: Optional[int] = None) -> Optional[Tuple[int, int]]:
     """
     Extract width and height from an image file.
     
+    Results are memoized. Callers that pass the file's modification time
+    and size get a fresh read whenever the file changes.
+    
     Args:
         file_path: Path to the image file
+        modified_time: File modification time, used only as a cache key
+        size: File size in bytes, used only as a cache key
         
     Returns:
         Tuple of (width, height) or None if unable to read
@@ -47,27 +129,22 @@ def get_image_resolution(file_path: str) -> Optional[Tuple[int, int]]:
         return None
 
 
-def is_system_folder(folder_path: str) -> bool:
+def is_system_folder(folder_path: str, attributes: Optional[int] = None) -> bool:
     """
     Check if a folder is a system or hidden folder that should be excluded.
     
     Args:
         folder_path: Path to the folder
+        attributes: Windows file attribute bits if already known (e.g. from
+                    os.DirEntry.stat().st_file_attributes); looked up otherwise
         
     Returns:
         True if folder should be excluded, False otherwise
     """
-    # Common system folders on Windows
-    system_folders = {
-        '$recycle.bin', 'system volume information', 'windows',
-        'program files', 'program files (x86)', 'programdata',
-        'appdata', '$windows.~bt', 'recovery', 'perflogs'
-    }
-    
     folder_name = os.path.basename(folder_path).lower()
     
     # Check if it's a system folder
-    if folder_name in system_folders:
+    if folder_name in SYSTEM_FOLDERS:
         return True
     
     # Check if it starts with special characters (hidden/system)
@@ -75,57 +152,195 @@ def is_system_folder(folder_path: str) -> bool:
         return True
     
     # Check Windows file attributes for hidden/system flags
+    if attributes is None:
+        if _GetFileAttributesW is None:
+            return False  # If we can't check attributes, don't exclude
+        attributes = _GetFileAttributesW(folder_path)
+        if attributes == INVALID_FILE_ATTRIBUTES:
+            return False
+    
+    # FILE_ATTRIBUTE_HIDDEN = 0x2, FILE_ATTRIBUTE_SYSTEM = 0x4
+    return bool(attributes & 0x6)
+
+
+# Largest edge of a freedesktop "normal" size thumbnail
+THUMBNAIL_NORMAL_SIZE = 128
+
+# Thumbnail directories already created during this run
+_ensured_dirs = set()
+
+
+def get_user_cache_dir() -> str:
+    """
+    Get the per-user cache directory.
+    
+    This is %LOCALAPPDATA% (or ~/AppData/Local) on Windows, and
+    $XDG_CACHE_HOME (or ~/.cache) elsewhere.
+    
+    Returns:
+        Path of the user's cache directory
+    """
+    if os.name == 'nt':
+        return os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
+    return os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+
+
+def get_thumbnail_cache_dir() -> str:
+    """
+    Get the per-user thumbnail directory.
+    
+    On POSIX this is the "normal" size directory of the freedesktop.org
+    thumbnail spec, which desktop file managers read and write too. Windows
+    has no such shared cache, so thumbnails go in the application's own
+    folder under %LOCALAPPDATA%, in the same format.
+    
+    Returns:
+        Path of the directory holding normal size thumbnails
+    """
+    if os.name == 'nt':
+        return os.path.join(get_user_cache_dir(), 'duplicate-file-finder', 'thumbnails')
+    return os.path.join(get_user_cache_dir(), 'thumbnails', 'normal')
+
+
+def ensure_thumbnail_dir(directory: str):
+    """
+    Create a thumbnail directory (private to the user) if it does not exist.
+    
+    Each directory is created at most once per run, so writing a thumbnail
+    does not cost an extra makedirs call.
+    
+    Args:
+        directory: Directory that will hold thumbnails
+    """
+    if directory not in _ensured_dirs:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        _ensured_dirs.add(directory)
+
+
+def replace_thumbnail(thumbnail_path: str, save: Callable[[str], None]):
+    """
+    Write a thumbnail under a unique temporary name, then move it into place.
+    
+    Other readers never see a partial file, and two threads thumbnailing the
+    same image never share a temporary file. If saving fails, the temporary
+    file is removed and the error is re-raised.
+    
+    Args:
+        thumbnail_path: Final path of the thumbnail
+        save: Called with the temporary path; writes the PNG there
+    """
+    fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(thumbnail_path))
+    os.close(fd)
     try:
-        import ctypes
-        attrs = ctypes.windll.kernel32.GetFileAttributesW(folder_path)
-        # FILE_ATTRIBUTE_HIDDEN = 0x2, FILE_ATTRIBUTE_SYSTEM = 0x4
-        if attrs != -1 and (attrs & 0x2 or attrs & 0x4):
-            return True
-    except Exception:
-        pass  # If we can't check attributes, don't exclude
+        save(temp_path)
+        # The spec requires thumbnails to be readable by the owner only
+        os.chmod(temp_path, 0o600)
+        os.replace(temp_path, thumbnail_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def get_thumbnail_cache_path(file_path: str, cache_dir: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Locate the cached thumbnail for a file.
+    
+    Args:
+        file_path: Path to the original image
+        cache_dir: Thumbnail directory, or None for the shared one
+        
+    Returns:
+        Tuple of (file URI, thumbnail path); the thumbnail is named after
+        the MD5 of the URI, as the spec requires
+    """
+    uri = pathlib.Path(os.path.abspath(file_path)).as_uri()
+    file_hash = hashlib.md5(uri.encode('utf-8')).hexdigest()
+    return uri, os.path.join(cache_dir or get_thumbnail_cache_dir(), f"{file_hash}.png")
+
+
+def read_cached_thumbnail(file_path: str, cache_dir: Optional[str] = None,
+                          mtime: Optional[int] = None) -> Optional[bytes]:
+    """
+    Read an up-to-date cached thumbnail into memory.
     
-    return False
+    A thumbnail is reused only if its Thumb::URI matches the file and its
+    Thumb::MTime matches the file's current modification time. The PNG is
+    read once, and both those tags and (by the caller) the pixels come from
+    the same bytes, rather than opening the file once to check it and again
+    to decode it.
+    
+    Args:
+        file_path: Path to the original image
+        cache_dir: Thumbnail directory, or None for the shared one
+        mtime: The file's modification time in whole seconds, if the caller
+            has already stat'ed it
+        
+    Returns:
+        PNG data of the cached thumbnail, or None if there is no current one
+    """
+    uri, thumbnail_path = get_thumbnail_cache_path(file_path, cache_dir)
+    try:
+        mtime = str(int(os.stat(file_path).st_mtime) if mtime is None else mtime)
+        with open(thumbnail_path, 'rb') as f:
+            data = f.read()
+        with Image.open(io.BytesIO(data)) as thumbnail:
+            info = thumbnail.info
+    except (OSError, ValueError):
+        return None
+    
+    if info.get('Thumb::URI') != uri or info.get('Thumb::MTime') != mtime:
+        return None
+    return data
 
 
-def generate_thumbnail(file_path: str, thumbnail_size: Tuple[int, int] = (150, 150), 
-                      cache_dir: str = "thumbnails") -> Optional[str]:
+def generate_thumbnail(file_path: str, thumbnail_size: Tuple[int, int] = (THUMBNAIL_NORMAL_SIZE, THUMBNAIL_NORMAL_SIZE),
+                      cache_dir: Optional[str] = None) -> Optional[str]:
     """
     Generate a thumbnail for an image file.
     
+    Thumbnails are PNGs in the user thumbnail cache (get_thumbnail_cache_dir),
+    so they are reused across runs and working directories; on POSIX that is
+    the shared freedesktop.org cache, and thumbnails made by the desktop are
+    picked up as cache hits.
+    
     Args:
         file_path: Path to the original image
         thumbnail_size: Size of the thumbnail as (width, height)
-        cache_dir: Directory to store cached thumbnails
+        cache_dir: Directory to store cached thumbnails, or None for the shared one
         
     Returns:
         Path to the generated thumbnail or None if failed
     """
     try:
-        # Create cache directory if it doesn't exist
-        os.makedirs(cache_dir, exist_ok=True)
-        
-        # Generate thumbnail filename from original file's hash
-        file_hash = hashlib.md5(file_path.encode()).hexdigest()
-        thumbnail_ext = os.path.splitext(file_path)[1].lower()
-        if thumbnail_ext not in ['.jpg', '.jpeg', '.png']:
-            thumbnail_ext = '.jpg'
-        
-        thumbnail_path = os.path.join(cache_dir, f"{file_hash}{thumbnail_ext}")
-        
-        # Return cached thumbnail if it exists
-        if os.path.exists(thumbnail_path):
+        mtime = int(os.stat(file_path).st_mtime)
+        uri, thumbnail_path = get_thumbnail_cache_path(file_path, cache_dir)
+        if read_cached_thumbnail(file_path, cache_dir, mtime) is not None:
             return thumbnail_path
         
+        ensure_thumbnail_dir(os.path.dirname(thumbnail_path))
+        
         # Generate new thumbnail
-        with Image.open(file_path) as img:
-            # Convert RGBA to RGB if necessary (for JPEG)
-            if img.mode == 'RGBA' and thumbnail_ext in ['.jpg', '.jpeg']:
-                img = img.convert('RGB')
-            
-            # Create thumbnail maintaining aspect ratio
-            img.thumbnail(thumbnail_size, Image.Resampling.LANCZOS)
-            img.save(thumbnail_path, quality=85, optimize=True)
+        img = _vips_thumbnail(file_path, thumbnail_size) if PYVIPS_AVAILABLE else None
+        if img is None:
+            with Image.open(file_path) as source:
+                # Create thumbnail maintaining aspect ratio
+                source.thumbnail(thumbnail_size, Image.Resampling.LANCZOS)
+                img = source.copy() if source.mode in ('RGB', 'RGBA') else source.convert('RGBA')
+        
+        try:
+            png_info = PngImagePlugin.PngInfo()
+            png_info.add_text('Thumb::URI', uri)
+            png_info.add_text('Thumb::MTime', str(mtime))
             
+            replace_thumbnail(thumbnail_path, lambda temp_path: img.save(temp_path, format='PNG', pnginfo=png_info))
+        finally:
+            # Free the pixel buffer now rather than whenever the pool thread's
+            # frame is collected
+            img.close()
+        
         return thumbnail_path
         
     except Exception as e:
@@ -133,24 +348,76 @@ def generate_thumbnail(file_path: str, thumbnail_size: Tuple[int, int] = (150, 1
         return None
 
 
-def compute_file_hash(file_path: str, algorithm: str = 'sha256', 
-                     chunk_size_kb: int = 64) -> Optional[str]:
+def _vips_thumbnail(file_path: str, thumbnail_size: Tuple[int, int]) -> Optional[Image.Image]:
+    """
+    Shrink an image with libvips, which scales while decoding.
+    
+    Large originals are never held in memory at full size. The result is
+    handed to PIL so the PNG is written with the same tags either way.
+    
+    Returns:
+        8-bit sRGB(A) thumbnail, or None if libvips cannot read the file
+    """
+    try:
+        thumb = pyvips.Image.thumbnail(file_path, thumbnail_size[0], height=thumbnail_size[1])
+        thumb = thumb.colourspace('srgb').cast('uchar')
+        mode = 'RGBA' if thumb.bands == 4 else 'RGB'
+        return Image.frombytes(mode, (thumb.width, thumb.height), thumb.write_to_memory())
+    except pyvips.Error:
+        return None
+
+
+def compute_file_hash(file_path: str, algorithm: str = DEFAULT_HASH_ALGORITHM, 
+                     chunk_size_kb: int = 1024) -> Optional[str]:
     """
-    Compute cryptographic hash of a file using chunked reading.
+    Compute cryptographic hash of a file.
+    
+    Files above MMAP_HASH_THRESHOLD are memory-mapped and hashed window by
+    window while the next window is prefetched; smaller files use hashlib.file_digest when available and
+    chunked reading otherwise.
     
     Args:
         file_path: Path to the file
-        algorithm: Hash algorithm ('sha256', 'md5', etc.)
-        chunk_size_kb: Size of chunks to read in KB
+        algorithm: Hash algorithm ('blake3', 'sha256', 'md5', etc.)
+        chunk_size_kb: Size of chunks to read in KB (chunked fallback only)
         
     Returns:
         Hexadecimal hash string or None if failed
     """
     try:
-        hash_func = hashlib.new(algorithm)
+        if algorithm == 'blake3':
+            hash_func = blake3.blake3()
+        else:
+            hash_func = hashlib.new(algorithm)
         chunk_size = chunk_size_kb * 1024
         
         with open(file_path, 'rb') as f:
+            fd = f.fileno()
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            
+            # Large files: hash the mapping directly, no per-chunk bytes copies
+            if os.fstat(fd).st_size > MMAP_HASH_THRESHOLD:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    if not hasattr(mm, 'madvise'):
+                        hash_func.update(view)
+                        return hash_func.hexdigest()
+                    
+                    # Double-buffer: ask the kernel to start reading the next
+                    # window while the current one is being hashed
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                    size = len(mm)
+                    for start in range(0, size, MMAP_HASH_WINDOW):
+                        next_start = start + MMAP_HASH_WINDOW
+                        if next_start < size:
+                            mm.madvise(mmap.MADV_WILLNEED, next_start, min(MMAP_HASH_WINDOW, size - next_start))
+                        hash_func.update(view[start:next_start])
+                return hash_func.hexdigest()
+            
+            # Python 3.11+: run the read loop in C
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, lambda: hash_func).hexdigest()
+            
             while chunk := f.read(chunk_size):
                 hash_func.update(chunk)
         
@@ -161,6 +428,30 @@ def compute_file_hash(file_path: str, algorithm: str = 'sha256',
         return None
 
 
+def compute_partial_hash(file_path: str, offset: int = 0, length: int = 4096) -> Optional[bytes]:
+    """
+    Compute a short digest of a slice of a file.
+    
+    Used as a cheap probe to split candidate groups before full hashing.
+    
+    Args:
+        file_path: Path to the file
+        offset: Byte offset to start reading from (negative = from end of file)
+        length: Number of bytes to read
+        
+    Returns:
+        16-byte BLAKE2b digest or None if failed
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            f.seek(offset, os.SEEK_END if offset < 0 else os.SEEK_SET)
+            return hashlib.blake2b(f.read(length), digest_size=16).digest()
+        
+    except Exception as e:
+        logger.error(f"Unable to compute partial hash for {file_path}: {e}")
+        return None
+
+
 def is_file_locked(file_path: str) -> bool:
     """
     Check if a file is locked by another process.
@@ -171,13 +462,32 @@ def is_file_locked(file_path: str) -> bool:
     Returns:
         True if file is locked, False otherwise
     """
+    if _GetFileAttributesW is not None:
+        # Ask for delete access while sharing everything: this only fails if
+        # another process holds the file without FILE_SHARE_DELETE. Nothing is
+        # written, so the file's timestamps are left alone.
+        handle = _CreateFileW(file_path, _DELETE_ACCESS, _FILE_SHARE_ALL, None, _OPEN_EXISTING, 0, None)
+        if handle == INVALID_HANDLE_VALUE:
+            return True
+        _CloseHandle(handle)
+        return False
+    
+    # POSIX has no mandatory locks; report unwritable files and files holding
+    # an advisory lock
+    if not os.access(file_path, os.W_OK):
+        return True
     try:
-        # Try to open the file in exclusive mode
-        with open(file_path, 'a'):
-            pass
+        fd = os.open(file_path, os.O_RDONLY | os.O_NONBLOCK)
+    except OSError:
+        return True
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        fcntl.flock(fd, fcntl.LOCK_UN)
         return False
-    except (IOError, OSError):
+    except OSError:
         return True
+    finally:
+        os.close(fd)
 
 
 def get_file_times(file_path: str) -> Tuple[float, float]:
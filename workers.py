@@ -0,0 +1,75 @@
+"""
+Worker process tasks for Duplicate File Finder.
+Kept free of Qt and engine imports, so a spawned worker only loads what its task needs.
+"""
+
+import logging
+
+from logger import get_logger
+
+# Smallest size JPEGs are decoded at before computing the perceptual hash
+PHASH_DRAFT_SIZE = 16
+
+
+def init_worker():
+    """
+    Set up a worker process (the executor's initializer).
+    
+    Workers report problems through their return values, so the application
+    logger is silenced instead of configured: a worker never opens the log
+    file, and a forked worker does not keep queueing records for a listener
+    thread that only exists in the parent.
+    """
+    logger = get_logger()
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+
+def compute_phash(file_path: str) -> tuple:
+    """
+    Compute the perceptual hash of one image.
+    
+    Returns:
+        Tuple of (ImageHash or None, error message or None)
+    """
+    import imagehash
+    from PIL import Image
+    
+    try:
+        with Image.open(file_path) as img:
+            # Let JPEG decode at reduced scale; aHash only needs 8x8
+            img.draft('L', (PHASH_DRAFT_SIZE, PHASH_DRAFT_SIZE))
+            return imagehash.average_hash(img), None
+    except Exception as e:
+        return None, str(e)
+
+
+def scan_root_columns(config_path: str, root_path: str) -> dict:
+    """
+    Scan one root directory.
+    
+    Args:
+        config_path: Path to configuration file
+        root_path: Root directory to scan
+    
+    Returns:
+        Dictionary of per-file columns (paths, extensions, sizes, created,
+        modified) plus the scan's error messages
+    """
+    import numpy as np
+    from file_scanner import FileScanner
+    
+    scanner = FileScanner(config_path)
+    files = scanner.scan_root(root_path)
+    count = len(files)
+    
+    return {
+        'paths': [f.path for f in files],
+        'extensions': [f.extension for f in files],
+        'sizes': np.fromiter((f.size for f in files), np.int64, count),
+        'created': np.fromiter((f.created_time for f in files), np.float64, count),
+        'modified': np.fromiter((f.modified_time for f in files), np.float64, count),
+        'errors': scanner.errors
+    }